@@ -10,6 +10,9 @@ from typing import Dict, Optional
 class ProgressDisplay:
     """Display progress in wget/axel style"""
     
+    # Minimum nanoseconds between redraws; the final update is always drawn
+    MIN_INTERVAL_NS = 100_000_000
+    
     def __init__(self, output_stream=None):
         """
         Initialize display
@@ -18,15 +21,13 @@ class ProgressDisplay:
             output_stream: Output stream (default: sys.stdout)
         """
         self.output_stream = output_stream or sys.stdout
-        self.start_time = None
-        self.last_update_time = None
-        self.last_file = None
+        self.start_time_ns = None
+        self.last_update_ns = None
     
     def start(self, total: int):
         """Start progress display"""
-        self.start_time = time.time()
-        self.last_update_time = self.start_time
-        self.last_file = None
+        self.start_time_ns = time.monotonic_ns()
+        self.last_update_ns = None
     
     def update(self, file_path: str, current: int, total: int, result: Optional[Dict] = None):
         """
@@ -38,28 +39,34 @@ class ProgressDisplay:
             total: Total files
             result: Processing result
         """
-        now = time.time()
-        elapsed = now - self.start_time if self.start_time else 0
+        now_ns = time.monotonic_ns()
+        
+        # Coalesce redraws: terminal writes dominate when files process quickly
+        if (current < total and self.last_update_ns is not None
+                and now_ns - self.last_update_ns < self.MIN_INTERVAL_NS):
+            return
         
-        # Calculate speed
-        if elapsed > 0:
-            speed = current / elapsed
+        elapsed_ns = now_ns - self.start_time_ns if self.start_time_ns else 0
+        
+        # Speed in tenths of files/s (integer math, rounded)
+        if elapsed_ns > 0:
+            speed_tenths = (current * 20_000_000_000 + elapsed_ns) // (2 * elapsed_ns)
         else:
-            speed = 0
+            speed_tenths = 0
         
-        # Calculate ETA
-        if speed > 0:
-            remaining = total - current
-            eta = remaining / speed
-            eta_str = self._format_time(eta)
+        # ETA: remaining files at the average time per file so far
+        if current > 0 and elapsed_ns > 0:
+            eta_str = self._format_time((total - current) * elapsed_ns // current // 1_000_000_000)
         else:
             eta_str = "--:--"
         
-        # Progress percentage
+        # Progress percentage in tenths of a percent (rounded)
         if total > 0:
-            percent = (current / total) * 100
+            percent_tenths = (current * 2000 + total) // (2 * total)
         else:
-            percent = 0
+            percent_tenths = 0
+        percent = f"{percent_tenths // 10}.{percent_tenths % 10}"
+        speed = f"{speed_tenths // 10}.{speed_tenths % 10}"
         
         # File name (truncate if too long)
         filename = os.path.basename(file_path)
@@ -77,24 +84,22 @@ class ProgressDisplay:
                 status = "UPDATED"
         
         # Format: [progress%] filename [status] [speed] [eta]
-        line = f"[{percent:5.1f}%] {filename:40s} [{status:7s}] [{speed:.1f} files/s] [ETA: {eta_str}]"
-        
-        # Clear previous line and write new one
-        if self.last_file:
-            # Move cursor up and clear line
-            self.output_stream.write('\r' + ' ' * 80 + '\r')
+        line = ''.join((
+            '[', percent.rjust(5), '%] ', filename.ljust(40),
+            ' [', status.ljust(7), '] [', speed, ' files/s] [ETA: ', eta_str, ']'
+        ))
         
-        self.output_stream.write(line)
+        # Rewrite the line in place and erase whatever is left of the previous one
+        self.output_stream.write('\r' + line + '\x1b[K')
         self.output_stream.flush()
         
-        self.last_file = file_path
-        self.last_update_time = now
+        self.last_update_ns = now_ns
     
     def finish(self, stats: Dict):
         """Finish and display summary"""
         self.output_stream.write('\n')
         
-        elapsed = time.time() - self.start_time if self.start_time else 0
+        elapsed = (time.monotonic_ns() - self.start_time_ns) / 1_000_000_000 if self.start_time_ns else 0
         
         summary = f"""
 Processing complete:
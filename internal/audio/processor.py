@@ -1,34 +1,96 @@
 """
 Audio processor - batch processing coordinator
 """
+import itertools
+import multiprocessing
 import os
+import random
 import re
-import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from typing import List, Dict, Callable, Optional
-from queue import Queue
 from internal.audio.scanner import AudioScanner
 from internal.audio.tagger import AudioTagger
 from internal.audio.writer import AudioWriter
 from internal.audio.encoder import EncodingDetector
 
 
+# Ad patterns and decorations removed from filenames, precompiled and applied
+# in this order; each works on the previous one's result, so they are not
+# fused into one alternation (that changes which text gets removed)
+_AD_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'[-]{2,}',  # Multiple dashes (----)
+    r'[_]{2,}',  # Multiple underscores (____)
+    r'[=]{2,}',  # Multiple equals (====)
+    r'[~]{2,}',  # Multiple tildes (~~~~)
+    r'[\.]{2,}',  # Multiple dots (....)
+    r'^\s+',     # Leading spaces
+    r'\s+$',     # Trailing spaces
+    r'\s{2,}',   # Multiple spaces
+    # Ad keywords
+    r'www\.\w+\.(com|net|org|cn)',
+    r'@\w+',
+    r'\[.*?广告.*?\]',
+    r'\(.*?广告.*?\)',
+    r'\[.*?推广.*?\]',
+    r'\(.*?推广.*?\)',
+))
+_SEP_RE = re.compile(r'[-_\s]+')
+# Track number at the start of a filename ("01 Title", "1. Title", "1-Title")
+_LEADING_NUM = re.compile(r'^(\d+)')
+# Album/title split in names like "Album - Title" or "Album__Title"
+_SPLIT_SEP = re.compile(r'[-_\s]{2,}')
+
+# Tag fields checked by _fix_encoding
+_TEXT_FIELDS = ('title', 'artist', 'album', 'genre', 'albumartist')
+
+# Files handed to a worker process per submission; a stop request waits for
+# at most this many files per worker, so keep it small
+PROCESS_CHUNK_SIZE = 8
+
+# Per-process processor used by _process_chunk, created on first use
+_worker_processor: Optional['AudioProcessor'] = None
+
+
+def _process_chunk(files: List[str], root_path: str, options: Dict) -> List:
+    """
+    Process a chunk of files inside a worker process
+    
+    Module-level so ProcessPoolExecutor can pickle it by reference.
+    
+    Returns:
+        List of (file_path, result) tuples
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = AudioProcessor(num_workers=1)
+        _worker_processor.is_running = True
+    
+    return [_worker_processor._process_file_safe(file_path, root_path, options)
+            for file_path in files]
+
+
 class AudioProcessor:
     """Batch audio file processor"""
     
-    def __init__(self, num_workers: int = 4):
+    def __init__(self, num_workers: int = 4, use_processes: bool = False):
         """
         Initialize processor
         
         Args:
-            num_workers: Number of worker threads
+            num_workers: Number of worker threads or processes
+            use_processes: Process files in a process pool instead of threads
         """
         self.num_workers = num_workers
+        self.use_processes = use_processes
         self.scanner = AudioScanner()
         self.tagger = AudioTagger()
         self.writer = AudioWriter()
         self.encoder = EncodingDetector()
         self.progress_callback: Optional[Callable] = None
         self.is_running = False
+        # Album name per directory, valid for one process_directory run
+        self._album_cache: Dict[str, Optional[str]] = {}
     
     def set_progress_callback(self, callback: Callable):
         """Set progress callback function"""
@@ -50,6 +112,7 @@ class AudioProcessor:
             Processing statistics
         """
         self.is_running = True
+        self._album_cache = {}
         
         # Scan files
         files = self.scanner.scan_directory(root_path, recursive=True)
@@ -68,12 +131,15 @@ class AudioProcessor:
             'renamed': 0
         }
         
-        if self.num_workers > 1:
+        if self.num_workers > 1 and self.use_processes:
+            results = self._process_multiprocess(files, root_path, options)
+        elif self.num_workers > 1:
             results = self._process_multithreaded(files, root_path, options)
         else:
             results = self._process_singlethreaded(files, root_path, options)
         
         self.is_running = False
+        self._album_cache.clear()
         return results
     
     def _process_singlethreaded(self, files: List[str], root_path: str, options: Dict) -> Dict:
@@ -88,35 +154,96 @@ class AudioProcessor:
         }
         
         for file_path in files:
-            if not self.is_running:
+            file_path, result = self._process_file_safe(file_path, root_path, options)
+            if result is None:
                 break
             
+            self._count_result(results, result)
+            if self.progress_callback:
+                self.progress_callback(file_path, results['processed'], results['total'], result)
+        
+        return results
+    
+    def _process_multithreaded(self, files: List[str], root_path: str, options: Dict) -> Dict:
+        """
+        Process files using multiple threads with work stealing
+        
+        Files are dealt round-robin into one deque per worker. A worker pops from
+        the tail of its own deque and, once that runs dry, steals from the head of
+        another worker's deque. deque.pop()/popleft() are atomic, so there is no
+        shared queue or lock; each worker keeps local counters merged at the end.
+        """
+        num_workers = min(self.num_workers, len(files))
+        deques = [deque(files[i::num_workers]) for i in range(num_workers)]
+        total = len(files)
+        progress = itertools.count(1)
+        
+        def next_file(index: int) -> Optional[str]:
             try:
-                result = self._process_file(file_path, root_path, options)
-                results['processed'] += 1
-                if result.get('fixed'):
-                    results['fixed'] += 1
-                if result.get('updated'):
-                    results['updated'] += 1
-                if result.get('renamed'):
-                    results['renamed'] += 1
+                return deques[index].pop()
+            except IndexError:
+                pass
+            
+            # Own deque is empty - steal from a random victim, trying each once
+            start = random.randrange(num_workers)
+            for offset in range(num_workers):
+                try:
+                    return deques[(start + offset) % num_workers].popleft()
+                except IndexError:
+                    continue
+            return None
+        
+        def worker(index: int) -> Dict:
+            # Worker-local counters: nothing shared is written per file
+            counts = {'processed': 0, 'errors': 0, 'fixed': 0, 'updated': 0, 'renamed': 0}
+            while self.is_running:
+                file_path = next_file(index)
+                if file_path is None:
+                    break
                 
+                file_path, result = self._process_file_safe(file_path, root_path, options)
+                if result is None:
+                    break
+                
+                self._count_result(counts, result)
                 if self.progress_callback:
-                    self.progress_callback(file_path, results['processed'], results['total'], result)
-                    
-            except Exception as e:
-                results['errors'] += 1
-                if self.progress_callback:
-                    self.progress_callback(file_path, results['processed'], results['total'], {'error': str(e)})
+                    self.progress_callback(file_path, next(progress), total, result)
+            return counts
+        
+        results = {
+            'total': total,
+            'processed': 0,
+            'errors': 0,
+            'fixed': 0,
+            'updated': 0,
+            'renamed': 0
+        }
+        
+        # Merge the per-worker counters once every worker has finished
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [executor.submit(worker, i) for i in range(num_workers)]
+            for future in futures:
+                for key, value in future.result().items():
+                    results[key] += value
         
         return results
     
-    def _process_multithreaded(self, files: List[str], root_path: str, options: Dict) -> Dict:
-        """Process files using multiple threads"""
-        queue = Queue()
-        for file_path in files:
-            queue.put(file_path)
-        
+    def _process_multiprocess(self, files: List[str], root_path: str, options: Dict) -> Dict:
+        """
+        Process files in a process pool
+        
+        Tag parsing holds the GIL, so separate processes scale where threads
+        do not. Files are submitted in chunks of PROCESS_CHUNK_SIZE to keep
+        pickling overhead low; results come back to this thread, which counts
+        them and calls the progress callback, so the callback never has to be
+        picklable. Workers are spawned rather than forked, since forking a
+        process that runs Tk and other threads is unsafe.
+        
+        Cancellation is per chunk: stopping cancels every chunk that has not
+        started and returns without waiting, but a chunk already running in a
+        worker is finished (up to PROCESS_CHUNK_SIZE files per worker are
+        still written after the stop) and its results are not reported.
+        """
         results = {
             'total': len(files),
             'processed': 0,
@@ -125,54 +252,78 @@ class AudioProcessor:
             'updated': 0,
             'renamed': 0
         }
-        results_lock = threading.Lock()
+        num_chunks = (len(files) + PROCESS_CHUNK_SIZE - 1) // PROCESS_CHUNK_SIZE
+        num_workers = min(self.num_workers, num_chunks)
+        done = 0
         
-        def worker():
-            while self.is_running:
-                try:
-                    file_path = queue.get(timeout=1)
-                except:
+        executor = ProcessPoolExecutor(max_workers=num_workers,
+                                       mp_context=multiprocessing.get_context("spawn"))
+        futures = []
+        try:
+            futures = [
+                executor.submit(_process_chunk, files[i:i + PROCESS_CHUNK_SIZE], root_path, options)
+                for i in range(0, len(files), PROCESS_CHUNK_SIZE)
+            ]
+            
+            for future in as_completed(futures):
+                if not self.is_running:
                     break
                 
-                try:
-                    result = self._process_file(file_path, root_path, options)
-                    
-                    with results_lock:
-                        results['processed'] += 1
-                        if result.get('fixed'):
-                            results['fixed'] += 1
-                        if result.get('updated'):
-                            results['updated'] += 1
-                        if result.get('renamed'):
-                            results['renamed'] += 1
-                    
+                for file_path, result in future.result():
+                    done += 1
+                    self._count_result(results, result)
                     if self.progress_callback:
-                        self.progress_callback(file_path, results['processed'], results['total'], result)
-                        
-                except Exception as e:
-                    with results_lock:
-                        results['errors'] += 1
-                    if self.progress_callback:
-                        self.progress_callback(file_path, results['processed'], results['total'], {'error': str(e)})
-                
-                queue.task_done()
+                        self.progress_callback(file_path, done, results['total'], result)
+        finally:
+            # On stop (or error) drop the queued chunks and don't block on
+            # the running ones; shutdown(cancel_futures=) needs Python 3.9
+            for pending in futures:
+                pending.cancel()
+            executor.shutdown(wait=self.is_running)
         
-        threads = []
-        for _ in range(min(self.num_workers, len(files))):
-            t = threading.Thread(target=worker, daemon=True)
-            t.start()
-            threads.append(t)
+        return results
+    
+    @staticmethod
+    def _count_result(counts: Dict, result: Dict):
+        """Add a single file result to a counters dict"""
+        if 'error' in result:
+            counts['errors'] += 1
+            return
+        
+        counts['processed'] += 1
+        if result.get('fixed'):
+            counts['fixed'] += 1
+        if result.get('updated'):
+            counts['updated'] += 1
+        if result.get('renamed'):
+            counts['renamed'] += 1
+    
+    def _process_file_safe(self, file_path: str, root_path: str, options: Dict):
+        """
+        Process single file, capturing errors in the result
         
-        queue.join()
+        Returns:
+            Tuple of (file_path, result); result is None if processing was stopped
+            and contains an 'error' key if processing failed
+        """
+        if not self.is_running:
+            return file_path, None
         
-        return results
+        try:
+            return file_path, self._process_file(file_path, root_path, options)
+        except Exception as e:
+            return file_path, {'error': str(e)}
     
     def _process_file(self, file_path: str, root_path: str, options: Dict) -> Dict:
         """Process single file"""
         result = {'fixed': False, 'updated': False, 'renamed': False}
         
-        # Read current tags
-        tags = self.tagger.read_tags(file_path)
+        # Split the path once; helpers below take the components
+        dir_path, filename = os.path.split(file_path)
+        name, ext = os.path.splitext(filename)
+        
+        # Read current tags, keeping the parsed file for the write below
+        tags, audio_file = self.tagger.read_tags_with_file(file_path)
         if 'error' in tags:
             return result
         
@@ -184,30 +335,27 @@ class AudioProcessor:
         
         # Auto-detect album from directory
         if options.get('auto_album', False):
-            album = self._detect_album(file_path, root_path)
+            album = self._detect_album(dir_path, root_path)
             if album and (not tags.get('album') or options.get('overwrite_album', False)):
                 tags['album'] = album
         
         # Auto-generate title with zero-padding
         if options.get('auto_title', False):
-            title = self._generate_title(file_path, root_path)
+            title = self._generate_title(name)
             if title and (not tags.get('title') or options.get('overwrite_title', False)):
                 tags['title'] = title
         
         # Update tags
         if options.get('update_tags', False):
-            if self.writer.write_tags(file_path, tags):
+            if self.writer.write_tags(file_path, tags, audio_file=audio_file):
                 result['updated'] = True
         
         # Format filename
         if options.get('format_filename', False):
-            new_name = self._format_filename(file_path, tags, root_path)
+            new_name = self._format_filename(dir_path, name, ext, tags, root_path)
             if new_name:
-                renamed = self._rename_file(file_path, new_name)
-                if renamed:
+                if self._rename_file(file_path, dir_path, new_name):
                     result['renamed'] = True
-                    # Update file_path for subsequent operations
-                    file_path = os.path.join(os.path.dirname(file_path), new_name)
         
         return result
     
@@ -215,8 +363,12 @@ class AudioProcessor:
         """Fix encoding issues in tags"""
         fixed = False
         
-        text_fields = ['title', 'artist', 'album', 'genre', 'albumartist']
-        for field in text_fields:
+        # Most tags are clean: scan all fields in one pass before checking each one
+        # ('\n' is not a garbled marker, so joining cannot introduce a false hit)
+        if not self.encoder.has_encoding_issue('\n'.join(tags.get(field) or '' for field in _TEXT_FIELDS)):
+            return False
+        
+        for field in _TEXT_FIELDS:
             if field in tags and tags[field]:
                 text = tags[field]
                 if self.encoder.has_encoding_issue(text):
@@ -227,35 +379,42 @@ class AudioProcessor:
         
         return fixed
     
-    def _detect_album(self, file_path: str, root_path: str) -> Optional[str]:
-        """Detect album name from directory structure"""
+    def _detect_album(self, dir_path: str, root_path: str) -> Optional[str]:
+        """
+        Detect album name from directory structure
+        
+        Args:
+            dir_path: Directory containing the file
+            root_path: Root directory path
+        """
+        # All tracks of an album share a directory, so compute once per directory
+        if dir_path in self._album_cache:
+            return self._album_cache[dir_path]
+        
         try:
-            # Get relative path from root
-            rel_path = os.path.relpath(file_path, root_path)
-            dir_path = os.path.dirname(rel_path)
+            # Get directory relative to root
+            rel_dir = os.path.relpath(dir_path, root_path)
             
-            if dir_path and dir_path != '.':
+            if rel_dir and rel_dir != '.':
                 # Use directory name as album
-                album = os.path.basename(dir_path)
-                return album.strip()
-            
-            # If in root, use root directory name
-            album = os.path.basename(root_path)
-            return album.strip() if album else None
-            
+                album = os.path.basename(rel_dir).strip()
+            else:
+                # If in root, use root directory name
+                album = os.path.basename(root_path)
+                album = album.strip() if album else None
         except Exception:
-            return None
+            album = None
+        
+        self._album_cache[dir_path] = album
+        return album
     
-    def _generate_title(self, file_path: str, root_path: str) -> Optional[str]:
-        """Generate title from filename with zero-padding"""
+    def _generate_title(self, name: str) -> Optional[str]:
+        """Generate title from filename (without extension) with zero-padding"""
         try:
-            filename = os.path.basename(file_path)
-            name, ext = os.path.splitext(filename)
-            
             # Try to extract track number from filename
             # Patterns: "01 Title", "1. Title", "1-Title", etc.
             # Pattern: number at start
-            match = re.match(r'^(\d+)', name)
+            match = _LEADING_NUM.match(name)
             if match:
                 track_num = int(match.group(1))
                 # Zero-pad to 2 digits
@@ -282,49 +441,24 @@ class AudioProcessor:
         Returns:
             Cleaned filename
         """
-        # Common ad patterns and decorations
-        ad_patterns = [
-            r'[-]{2,}',  # Multiple dashes (----)
-            r'[_]{2,}',  # Multiple underscores (____)
-            r'[=]{2,}',  # Multiple equals (====)
-            r'[~]{2,}',  # Multiple tildes (~~~~)
-            r'[\.]{2,}',  # Multiple dots (....)
-            r'^\s+',     # Leading spaces
-            r'\s+$',     # Trailing spaces
-            r'\s{2,}',   # Multiple spaces
-        ]
-        
-        # Remove common ad keywords (case insensitive)
-        ad_keywords = [
-            r'www\.\w+\.(com|net|org|cn)',
-            r'@\w+',
-            r'\[.*?广告.*?\]',
-            r'\(.*?广告.*?\)',
-            r'\[.*?推广.*?\]',
-            r'\(.*?推广.*?\)',
-        ]
-        
         cleaned = filename
-        
-        # Remove ad patterns
-        for pattern in ad_patterns + ad_keywords:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        for pattern in _AD_PATTERNS:
+            cleaned = pattern.sub('', cleaned)
         
         # Remove common separators at start/end
         cleaned = cleaned.strip(' -_=~.()[]【】（）')
         
         # Clean up multiple separators
-        cleaned = re.sub(r'[-_\s]+', ' ', cleaned)
-        cleaned = cleaned.strip()
-        
-        return cleaned
+        return _SEP_RE.sub(' ', cleaned).strip()
     
-    def _format_filename(self, file_path: str, tags: Dict, root_path: str) -> Optional[str]:
+    def _format_filename(self, dir_path: str, name: str, ext: str, tags: Dict, root_path: str) -> Optional[str]:
         """
         Format filename as: Number + Album Style
         
         Args:
-            file_path: Current file path
+            dir_path: Directory containing the file
+            name: Current filename without extension
+            ext: File extension (with leading dot)
             tags: Audio tags
             root_path: Root directory path
             
@@ -332,9 +466,6 @@ class AudioProcessor:
             New filename or None
         """
         try:
-            filename = os.path.basename(file_path)
-            name, ext = os.path.splitext(filename)
-            
             # Get track number from tags or filename
             track_num = None
             if tags.get('track'):
@@ -344,7 +475,7 @@ class AudioProcessor:
             
             # If no track number in tags, try to extract from filename
             if track_num is None:
-                match = re.match(r'^(\d+)', name)
+                match = _LEADING_NUM.match(name)
                 if match:
                     track_num = int(match.group(1))
             
@@ -354,14 +485,14 @@ class AudioProcessor:
                 album_style = tags['album']
             else:
                 # Try to get from directory name
-                album_style = self._detect_album(file_path, root_path)
+                album_style = self._detect_album(dir_path, root_path)
             
             # If no album, try to extract from filename (after cleaning)
             if not album_style:
                 cleaned_name = self._clean_filename(name)
                 # Try to find album style pattern in filename
                 # Common patterns: "Album - Title", "Album_Title", etc.
-                parts = re.split(r'[-_\s]{2,}', cleaned_name)
+                parts = _SPLIT_SEP.split(cleaned_name)
                 if len(parts) > 1:
                     # Assume first part might be album style
                     album_style = parts[0].strip()
@@ -387,7 +518,7 @@ class AudioProcessor:
                 new_filename = new_name + ext
                 
                 # Only rename if different
-                if new_filename != filename:
+                if new_filename != name + ext:
                     return new_filename
             
             return None
@@ -395,26 +526,27 @@ class AudioProcessor:
         except Exception:
             return None
     
-    def _rename_file(self, old_path: str, new_filename: str) -> bool:
+    def _rename_file(self, old_path: str, dir_path: str, new_filename: str) -> bool:
         """
         Rename file
         
         Args:
             old_path: Old file path
+            dir_path: Directory containing the file
             new_filename: New filename (without path)
             
         Returns:
             True if successful
         """
         try:
-            dir_path = os.path.dirname(old_path)
             new_path = os.path.join(dir_path, new_filename)
             
             # Check if new file already exists
-            if os.path.exists(new_path) and new_path != old_path:
+            # (lexists: no symlink follow, and a dangling link still blocks the name)
+            if os.path.lexists(new_path) and new_path != old_path:
                 return False
             
-            os.rename(old_path, new_path)
+            os.replace(old_path, new_path)
             return True
         except Exception:
             return False
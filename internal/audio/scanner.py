@@ -2,14 +2,27 @@
 Audio file scanner - recursive directory scanning
 """
 import os
-from typing import List, Dict, Tuple
+from typing import Dict, Iterator, List, Optional
 
 
 class AudioScanner:
     """Recursive audio file scanner"""
     
     # Supported audio formats
-    AUDIO_EXTENSIONS = {'.mp3', '.flac', '.m4a', '.aac', '.ogg', '.wma', '.wav', '.ape', '.mp4'}
+    AUDIO_EXTENSIONS = {'.mp3', '.flac', '.m4a', '.aac', '.ogg', '.wma', '.wav', '.ape'}
+    
+    # Extensions that are usually video; only included if the header says audio
+    AMBIGUOUS_EXTENSIONS = {'.mp4'}
+    
+    # MP4 major brands of audio-only files
+    AUDIO_MP4_BRANDS = {b'M4A ', b'M4B '}
+    
+    # Extensions without the leading dot, for the scandir hot loop
+    _EXTS = frozenset(ext[1:] for ext in AUDIO_EXTENSIONS)
+    _AMBIGUOUS_EXTS = frozenset(ext[1:] for ext in AMBIGUOUS_EXTENSIONS)
+    
+    # Extension -> statistics bucket; everything else counts as 'other'
+    _STATS_KEY = {'mp3': 'mp3', 'flac': 'flac', 'm4a': 'm4a'}
     
     def __init__(self):
         """Initialize scanner"""
@@ -33,57 +46,80 @@ class AudioScanner:
         Returns:
             List of audio file paths
         """
-        self.files = []
+        self.files = [entry.path for entry in self.iter_audio_entries(root_path, recursive)]
+        return self.files
+    
+    def iter_audio_entries(self, root_path: str, recursive: bool = True) -> Iterator[os.DirEntry]:
+        """
+        Yield audio files under a directory as os.DirEntry objects
+        
+        Entries carry the file type from the directory listing and cache their
+        stat() result, so consumers can get size/mtime without another lookup
+        of the path. Statistics are reset and updated as entries are yielded.
+        
+        Args:
+            root_path: Root directory path
+            recursive: Whether to scan subdirectories
+            
+        Yields:
+            DirEntry of each audio file
+        """
         self.stats = {'total': 0, 'mp3': 0, 'flac': 0, 'm4a': 0, 'other': 0}
         
-        if recursive:
-            self._scan_recursive(root_path)
-        else:
-            self._scan_directory(root_path)
+        if not recursive:
+            yield from self._scan_directory(root_path)
+            return
         
-        return self.files
+        # Explicit stack instead of os.walk
+        stack = [root_path]
+        while stack:
+            yield from self._scan_directory(stack.pop(), stack)
     
-    def _scan_recursive(self, path: str):
-        """Recursively scan directory"""
+    def _scan_directory(self, path: str, subdirs: Optional[List[str]] = None) -> Iterator[os.DirEntry]:
+        """
+        Scan single directory with os.scandir
+        
+        Args:
+            path: Directory path
+            subdirs: If given, subdirectory paths are appended for recursive scanning
+            
+        Yields:
+            DirEntry of each audio file in the directory
+        """
+        exts = self._EXTS
+        ambiguous_exts = self._AMBIGUOUS_EXTS
+        stats_key = self._STATS_KEY
+        stats = self.stats
         try:
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if self._is_audio_file(file_path):
-                        self.files.append(file_path)
-                        self._update_stats(file_path)
+            with os.scandir(path) as it:
+                entries = list(it)
         except (PermissionError, OSError):
-            pass
+            return
+        
+        for entry in entries:
+            try:
+                # DirEntry caches the file type, so these checks need no extra stat
+                if subdirs is not None and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    base, _, ext = entry.name.rpartition('.')
+                    ext = ext.lower()
+                    if base and (ext in exts or
+                                 (ext in ambiguous_exts and self._is_audio_mp4(entry.path))):
+                        stats[stats_key.get(ext, 'other')] += 1
+                        stats['total'] += 1
+                        yield entry
+            except OSError:
+                continue
     
-    def _scan_directory(self, path: str):
-        """Scan single directory (non-recursive)"""
+    def _is_audio_mp4(self, file_path: str) -> bool:
+        """Check the ftyp box of an MP4 container for an audio-only brand"""
         try:
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                if os.path.isfile(item_path) and self._is_audio_file(item_path):
-                    self.files.append(item_path)
-                    self._update_stats(item_path)
-        except (PermissionError, OSError):
-            pass
-    
-    def _is_audio_file(self, file_path: str) -> bool:
-        """Check if file is an audio file"""
-        ext = os.path.splitext(file_path)[1].lower()
-        return ext in self.AUDIO_EXTENSIONS
-    
-    def _update_stats(self, file_path: str):
-        """Update statistics"""
-        ext = os.path.splitext(file_path)[1].lower()
-        self.stats['total'] += 1
-        
-        if ext == '.mp3':
-            self.stats['mp3'] += 1
-        elif ext == '.flac':
-            self.stats['flac'] += 1
-        elif ext == '.m4a':
-            self.stats['m4a'] += 1
-        else:
-            self.stats['other'] += 1
+            with open(file_path, 'rb') as f:
+                header = f.read(12)
+        except OSError:
+            return False
+        return header[4:8] == b'ftyp' and header[8:12] in self.AUDIO_MP4_BRANDS
     
     def get_statistics(self) -> Dict[str, int]:
         """Get scan statistics"""
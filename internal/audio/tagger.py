@@ -2,7 +2,7 @@
 Audio tag reader - read metadata tags
 """
 import os
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple, Union
 try:
     from mutagen import File as MutagenFile
     from mutagen.id3 import ID3NoHeaderError
@@ -13,6 +13,74 @@ try:
 except ImportError:
     MUTAGEN_AVAILABLE = False
 
+# Buffer for tag reads: large enough for typical ID3v2/FLAC metadata headers,
+# so mutagen's many small reads hit memory instead of the (possibly network) disk
+READ_BUFFER_SIZE = 65536
+
+# Tag name -> raw key, per container type
+_MP3_TAG_KEYS = {
+    'title': 'TIT2',
+    'artist': 'TPE1',
+    'album': 'TALB',
+    'year': 'TDRC',
+    'track': 'TRCK',
+    'genre': 'TCON',
+    'albumartist': 'TPE2',
+}
+_FLAC_TAG_KEYS = {
+    'title': 'TITLE',
+    'artist': 'ARTIST',
+    'album': 'ALBUM',
+    'year': 'DATE',
+    'track': 'TRACKNUMBER',
+    'genre': 'GENRE',
+    'albumartist': 'ALBUMARTIST',
+}
+# 'track' is read separately by _get_mp4_track
+_MP4_TAG_KEYS = {
+    'title': '\xa9nam',
+    'artist': '\xa9ART',
+    'album': '\xa9alb',
+    'year': '\xa9day',
+    'genre': '\xa9gen',
+    'albumartist': 'aART',
+}
+_GENERIC_TAG_KEYS = {
+    'title': 'title',
+    'artist': 'artist',
+    'album': 'album',
+    'year': 'date',
+    'track': 'tracknumber',
+    'genre': 'genre',
+    'albumartist': 'albumartist',
+}
+
+
+def _get_first_value(value_list: Any) -> Optional[str]:
+    """Get first value from list or return as string"""
+    if not value_list:
+        return None
+    
+    if isinstance(value_list, list):
+        return str(value_list[0])
+    
+    return str(value_list)
+
+
+def _get_mp4_track(trkn: Any) -> Optional[str]:
+    """Get track number from an MP4 trkn atom ([(number, total)])"""
+    return str(trkn[0][0]) if trkn else None
+
+
+# Extension -> (parser class, tag keys, value reader) for the formats read directly
+if MUTAGEN_AVAILABLE:
+    _OPENERS = {
+        '.mp3': (MP3, _MP3_TAG_KEYS, _get_first_value),
+        '.flac': (FLAC, _FLAC_TAG_KEYS, _get_first_value),
+        '.m4a': (MP4, _MP4_TAG_KEYS, _get_first_value),
+        '.mp4': (MP4, _MP4_TAG_KEYS, _get_first_value),
+    }
+
 
 class AudioTagger:
     """Read audio file metadata tags"""
@@ -22,130 +90,92 @@ class AudioTagger:
         if not MUTAGEN_AVAILABLE:
             raise ImportError("mutagen library is required. Install with: pip install mutagen")
     
-    def read_tags(self, file_path: str) -> Dict[str, Any]:
+    def read_tags(self, path_or_entry: Union[str, os.DirEntry]) -> Dict[str, Any]:
         """
         Read tags from audio file
         
         Args:
-            file_path: Path to audio file
+            path_or_entry: Path to audio file, or its DirEntry from a scan
             
         Returns:
             Dictionary with tag information
         """
-        if not os.path.exists(file_path):
-            return {}
+        return self.read_tags_with_file(path_or_entry)[0]
+    
+    def read_tags_with_file(self, path_or_entry: Union[str, os.DirEntry]) -> Tuple[Dict[str, Any], Any]:
+        """
+        Read tags from audio file, also returning the parsed mutagen object
+        
+        Passing the object on to AudioWriter.write_tags saves the file without
+        parsing it a second time.
         
+        Args:
+            path_or_entry: Path to audio file, or its DirEntry from a scan
+            
+        Returns:
+            Tuple of (tag dictionary as from read_tags, parsed file or None)
+        """
+        file_path = path_or_entry if isinstance(path_or_entry, str) else path_or_entry.path
         try:
-            audio_file = MutagenFile(file_path)
+            # No separate existence check: a missing file fails the open itself
+            try:
+                with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as fh:
+                    # Known extensions go straight to their parser; only
+                    # other files pay for MutagenFile's format sniffing
+                    opener = _OPENERS.get(os.path.splitext(file_path)[1].lower())
+                    audio_file = opener[0](fh) if opener else MutagenFile(fh)
+            except FileNotFoundError:
+                return {}, None
             if audio_file is None:
-                return {}
+                return {}, None
+            
+            # Resolve the container type once, then read all tags in one pass
+            if opener:
+                keymap, read_value = opener[1], opener[2]
+            elif isinstance(audio_file, MP3):
+                keymap, read_value = _MP3_TAG_KEYS, _get_first_value
+            elif isinstance(audio_file, FLAC):
+                keymap, read_value = _FLAC_TAG_KEYS, _get_first_value
+            elif isinstance(audio_file, MP4):
+                keymap, read_value = _MP4_TAG_KEYS, _get_first_value
+            else:
+                keymap, read_value = _GENERIC_TAG_KEYS, _get_first_value
             
             tags = {
                 'file': os.path.basename(file_path),
                 'path': file_path,
-                'title': self._get_tag(audio_file, 'title'),
-                'artist': self._get_tag(audio_file, 'artist'),
-                'album': self._get_tag(audio_file, 'album'),
-                'year': self._get_tag(audio_file, 'date'),
-                'track': self._get_tag(audio_file, 'tracknumber'),
-                'genre': self._get_tag(audio_file, 'genre'),
-                'albumartist': self._get_tag(audio_file, 'albumartist'),
             }
+            # get() returns None for missing keys; anything else that fails is
+            # reported through the error result below
+            get = audio_file.get
+            for name, raw_key in keymap.items():
+                tags[name] = read_value(get(raw_key))
+            if keymap is _MP4_TAG_KEYS:
+                tags['track'] = _get_mp4_track(get('trkn'))
             
             # Get file info
-            if hasattr(audio_file, 'info'):
-                info = audio_file.info
-                if hasattr(info, 'length'):
-                    tags['duration'] = int(info.length)
-                if hasattr(info, 'bitrate'):
-                    tags['bitrate'] = info.bitrate
+            info = getattr(audio_file, 'info', None)
+            if info is not None:
+                length = getattr(info, 'length', None)
+                if length is not None:
+                    tags['duration'] = int(length)
+                bitrate = getattr(info, 'bitrate', None)
+                if bitrate is not None:
+                    tags['bitrate'] = bitrate
             
-            return tags
+            return tags, audio_file
         except (ID3NoHeaderError, Exception) as e:
             return {
                 'file': os.path.basename(file_path),
                 'path': file_path,
                 'error': str(e)
-            }
-    
-    def _get_tag(self, audio_file: Any, tag_name: str) -> Optional[str]:
-        """Get tag value from audio file"""
-        try:
-            # MP3 files
-            if isinstance(audio_file, MP3):
-                if tag_name == 'title':
-                    return self._get_first_value(audio_file.get('TIT2', []))
-                elif tag_name == 'artist':
-                    return self._get_first_value(audio_file.get('TPE1', []))
-                elif tag_name == 'album':
-                    return self._get_first_value(audio_file.get('TALB', []))
-                elif tag_name == 'date':
-                    return self._get_first_value(audio_file.get('TDRC', []))
-                elif tag_name == 'tracknumber':
-                    return self._get_first_value(audio_file.get('TRCK', []))
-                elif tag_name == 'genre':
-                    return self._get_first_value(audio_file.get('TCON', []))
-                elif tag_name == 'albumartist':
-                    return self._get_first_value(audio_file.get('TPE2', []))
-            
-            # FLAC files
-            elif isinstance(audio_file, FLAC):
-                tag_map = {
-                    'title': 'TITLE',
-                    'artist': 'ARTIST',
-                    'album': 'ALBUM',
-                    'date': 'DATE',
-                    'tracknumber': 'TRACKNUMBER',
-                    'genre': 'GENRE',
-                    'albumartist': 'ALBUMARTIST'
-                }
-                if tag_name in tag_map:
-                    return self._get_first_value(audio_file.get(tag_map[tag_name], []))
-            
-            # MP4/M4A files
-            elif isinstance(audio_file, MP4):
-                tag_map = {
-                    'title': '\xa9nam',
-                    'artist': '\xa9ART',
-                    'album': '\xa9alb',
-                    'date': '\xa9day',
-                    'tracknumber': 'trkn',
-                    'genre': '\xa9gen',
-                    'albumartist': 'aART'
-                }
-                if tag_name in tag_map:
-                    value = audio_file.get(tag_map[tag_name], [])
-                    if value:
-                        if tag_name == 'tracknumber':
-                            # MP4 tracknumber is a tuple
-                            if isinstance(value[0], tuple):
-                                return str(value[0][0])
-                            return str(value[0])
-                        return str(value[0])
-            
-            # Generic fallback
-            if tag_name in audio_file:
-                return self._get_first_value(audio_file[tag_name])
-            
-        except Exception:
-            pass
-        
-        return None
-    
-    def _get_first_value(self, value_list: Any) -> Optional[str]:
-        """Get first value from list or return as string"""
-        if not value_list:
-            return None
-        
-        if isinstance(value_list, list) and len(value_list) > 0:
-            return str(value_list[0])
-        
-        return str(value_list) if value_list else None
+            }, None
     
     def has_tags(self, file_path: str) -> bool:
         """Check if file has tags"""
         try:
-            audio_file = MutagenFile(file_path)
+            with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as fh:
+                audio_file = MutagenFile(fh)
             return audio_file is not None and len(audio_file) > 0
         except Exception:
             return False
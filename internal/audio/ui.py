@@ -4,12 +4,21 @@ Audio processor UI window
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+import queue
 import threading
+from collections import deque
 from typing import Optional
 from internal.audio.processor import AudioProcessor
 from internal.audio.display import ProgressDisplay
 
 
+# Interval between progress queue drains; events arriving in between are
+# applied to the widgets in one batch
+PROGRESS_INTERVAL_MS = 50
+
+# Log lines kept in the log widget; older lines are dropped
+LOG_MAX_LINES = 2000
+
 class AudioProcessorWindow:
     """Audio processing window"""
     
@@ -26,6 +35,14 @@ class AudioProcessorWindow:
         self.processor: Optional[AudioProcessor] = None
         self.is_processing = False
         
+        # Progress events from worker threads, applied by _drain_progress
+        self._progress_q: queue.Queue = queue.Queue()
+        self._drain_id: Optional[str] = None
+        
+        # Recent log lines, rendered into log_text by _render_log
+        self._log_ring: deque = deque(maxlen=LOG_MAX_LINES)
+        self._log_dirty = False
+        
         self._create_window()
         self._create_ui()
     
@@ -191,9 +208,9 @@ class AudioProcessorWindow:
         self.is_processing = True
         
         # Clear log
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        self._log_ring.clear()
+        self._log_dirty = True
+        self._render_log()
         
         # Get options
         options = {
@@ -206,7 +223,10 @@ class AudioProcessorWindow:
             'format_filename': self.format_filename_var.get()
         }
         
-        # Start processing in thread
+        # Start draining progress events, then processing in thread
+        self._progress_q = queue.Queue()
+        self._cancel_drain()
+        self._drain_id = self.window.after(PROGRESS_INTERVAL_MS, self._drain_progress)
         thread = threading.Thread(target=self._process_thread, args=(directory, options), daemon=True)
         thread.start()
     
@@ -214,12 +234,16 @@ class AudioProcessorWindow:
         """Process files in background thread"""
         try:
             # Create processor
-            self.processor = AudioProcessor(num_workers=4)
+            # Tag parsing is CPU-bound, so spread it over processes; scaling
+            # flattens out beyond ~8 workers
+            self.processor = AudioProcessor(
+                num_workers=min(8, os.cpu_count() or 4),
+                use_processes=True
+            )
             self.processor.set_progress_callback(self._on_progress)
             
-            # Update status
-            self._update_status("Scanning directory...")
-            self._log("Starting scan of: " + directory + "\n")
+            # Update status on the Tk thread; the log ring is only touched there
+            self.window.after(0, self._on_scan_start, directory)
             
             # Process
             results = self.processor.process_directory(directory, options)
@@ -231,46 +255,66 @@ class AudioProcessorWindow:
             self.window.after(0, self._on_error, str(e))
     
     def _on_progress(self, file_path: str, current: int, total: int, result: dict):
-        """Progress callback"""
-        def update():
+        """Progress callback - queue the event for the next _drain_progress tick"""
+        self._progress_q.put((file_path, current, total, result))
+    
+    def _drain_progress(self):
+        """Apply all queued progress events with one log insert, then re-arm"""
+        self._drain_id = None
+        lines = []
+        last = None
+        while True:
+            try:
+                last = self._progress_q.get_nowait()
+            except queue.Empty:
+                break
+            file_path, current, total, result = last
+            lines.append(f"[{current}/{total}] {os.path.basename(file_path)}"
+                         f"{self._describe_result(result)}\n")
+        
+        if last is not None:
+            file_path, current, total, result = last
+            
             # Update progress bar
             if total > 0:
-                progress = (current / total) * 100
-                self.progress_var.set(progress)
+                self.progress_var.set((current / total) * 100)
             
-            # Update status
-            status = f"Processing: {current}/{total} files"
-            if result:
-                if 'error' in result:
-                    status += f" - ERROR: {result['error']}"
-                elif result.get('fixed'):
-                    status += " - Encoding fixed"
-                elif result.get('updated'):
-                    status += " - Tags updated"
-                elif result.get('renamed'):
-                    status += " - File renamed"
-            self._update_status(status)
+            # Update status from the most recent event only
+            self._update_status(f"Processing: {current}/{total} files{self._describe_result(result)}")
             
             # Log
-            filename = os.path.basename(file_path)
-            log_line = f"[{current}/{total}] {filename}"
-            if result:
-                if 'error' in result:
-                    log_line += f" - ERROR: {result['error']}"
-                elif result.get('fixed'):
-                    log_line += " - Encoding fixed"
-                elif result.get('updated'):
-                    log_line += " - Tags updated"
-                elif result.get('renamed'):
-                    log_line += " - File renamed"
-            log_line += "\n"
-            self._log(log_line)
-        
-        self.window.after(0, update)
+            self._log(''.join(lines))
+        
+        self._render_log()
+        
+        if self.is_processing:
+            self._drain_id = self.window.after(PROGRESS_INTERVAL_MS, self._drain_progress)
+    
+    @staticmethod
+    def _describe_result(result: dict) -> str:
+        """Status suffix for a single file result"""
+        if result:
+            if 'error' in result:
+                return f" - ERROR: {result['error']}"
+            elif result.get('fixed'):
+                return " - Encoding fixed"
+            elif result.get('updated'):
+                return " - Tags updated"
+            elif result.get('renamed'):
+                return " - File renamed"
+        return ""
+    
+    def _cancel_drain(self):
+        """Stop the progress drain loop"""
+        if self._drain_id is not None:
+            self.window.after_cancel(self._drain_id)
+            self._drain_id = None
     
     def _on_complete(self, results: dict):
         """Processing complete"""
         self.is_processing = False
+        self._cancel_drain()
+        self._drain_progress()
         self.start_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
         
@@ -295,6 +339,8 @@ Processing complete!
     def _on_error(self, error: str):
         """Processing error"""
         self.is_processing = False
+        self._cancel_drain()
+        self._drain_progress()
         self.start_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
         
@@ -312,14 +358,35 @@ Processing complete!
         self._update_status("Stopped")
         self._log("Processing stopped by user\n")
     
+    def _on_scan_start(self, directory: str):
+        """Show the scan starting, as one Tk callback"""
+        self._update_status("Scanning directory...")
+        self._log("Starting scan of: " + directory + "\n")
+    
     def _update_status(self, text: str):
         """Update status label"""
         self.status_label.config(text=text)
     
     def _log(self, text: str):
-        """Add text to log"""
+        """
+        Add text to log
+        
+        While processing, lines are only collected and the widget is redrawn
+        by the next _drain_progress tick; otherwise it is redrawn right away.
+        """
+        self._log_ring.extend(text.splitlines(keepends=True))
+        self._log_dirty = True
+        if not self.is_processing:
+            self._render_log()
+    
+    def _render_log(self):
+        """Replace the log widget contents with the ring buffer, if it changed"""
+        if not self._log_dirty:
+            return
+        self._log_dirty = False
+        
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, text)
+        self.log_text.replace(1.0, tk.END, ''.join(self._log_ring))
         self.log_text.see(tk.END)
         self.log_text.config(state=tk.DISABLED)
     
@@ -328,6 +395,7 @@ Processing complete!
         if self.is_processing:
             if messagebox.askyesno("Confirm", "Processing is in progress. Stop and close?", parent=self.window):
                 self._stop_processing()
+                self._cancel_drain()
                 self.window.destroy()
         else:
             self.window.destroy()
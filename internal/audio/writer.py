@@ -2,7 +2,7 @@
 Audio tag writer - write metadata tags
 """
 import os
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Union
 try:
     from mutagen import File as MutagenFile
     from mutagen.id3 import ID3, TIT2, TPE1, TALB, TDRC, TRCK, TCON, TPE2, ID3NoHeaderError
@@ -14,6 +14,59 @@ except ImportError:
     MUTAGEN_AVAILABLE = False
 
 
+# Minimum padding left after the tag block on save. Tag edits that fit in the
+# padding are rewritten in place; without it, growing a tag shifts the whole
+# audio stream. A few KiB per file buys in-place re-saves.
+MIN_TAG_PADDING = 4096
+
+
+def _tag_padding(info: Any) -> int:
+    """mutagen padding callback: keep existing padding, but never below MIN_TAG_PADDING"""
+    return max(MIN_TAG_PADDING, info.padding)
+
+
+# Canonical tag key -> format field, walked by the _write_* loops.
+# Date and track need special handling and are written separately where noted.
+if MUTAGEN_AVAILABLE:
+    _MP3_FRAMES = (
+        ('title', 'TIT2', TIT2),
+        ('artist', 'TPE1', TPE1),
+        ('album', 'TALB', TALB),
+        ('year', 'TDRC', TDRC),
+        ('track', 'TRCK', TRCK),
+        ('genre', 'TCON', TCON),
+        ('albumartist', 'TPE2', TPE2),
+    )
+
+# DATE is taken from 'date', falling back to 'year'
+_FLAC_FIELDS = (
+    ('title', 'TITLE'),
+    ('artist', 'ARTIST'),
+    ('album', 'ALBUM'),
+    ('track', 'TRACKNUMBER'),
+    ('genre', 'GENRE'),
+    ('albumartist', 'ALBUMARTIST'),
+)
+
+# \xa9day is taken from 'date'/'year' and trkn is an integer pair
+_MP4_ATOMS = (
+    ('title', '\xa9nam'),
+    ('artist', '\xa9ART'),
+    ('album', '\xa9alb'),
+    ('genre', '\xa9gen'),
+    ('albumartist', 'aART'),
+)
+
+_GENERIC_FIELDS = (
+    ('title', 'title'),
+    ('artist', 'artist'),
+    ('album', 'album'),
+    ('year', 'date'),
+    ('track', 'tracknumber'),
+    ('genre', 'genre'),
+    ('albumartist', 'albumartist'),
+)
+
 class AudioWriter:
     """Write audio file metadata tags"""
     
@@ -22,159 +75,131 @@ class AudioWriter:
         if not MUTAGEN_AVAILABLE:
             raise ImportError("mutagen library is required. Install with: pip install mutagen")
     
-    def write_tags(self, file_path: str, tags: Dict[str, Any], encoding: str = 'utf-8') -> bool:
+    def write_tags(self, path_or_entry: Union[str, os.DirEntry], tags: Dict[str, Any],
+                   encoding: str = 'utf-8', audio_file: Any = None) -> bool:
         """
         Write tags to audio file
         
         Args:
-            file_path: Path to audio file
+            path_or_entry: Path to audio file, or its DirEntry from a scan
             tags: Dictionary with tag information
             encoding: Encoding for text tags (default: utf-8)
+            audio_file: File already parsed by AudioTagger.read_tags_with_file;
+                if given, its tags are updated and saved without re-reading
             
         Returns:
             True if successful
         """
-        if not os.path.exists(file_path):
-            return False
+        file_path = path_or_entry if isinstance(path_or_entry, str) else path_or_entry.path
+        if audio_file is not None:
+            return self._write_parsed(audio_file, file_path, tags, encoding)
+        
+        # Dispatch on extension so each file is opened and parsed exactly once;
+        # there is no separate existence check, a missing file fails the open
+        ext = os.path.splitext(file_path)[1].lower()
         
         try:
-            audio_file = MutagenFile(file_path)
-            if audio_file is None:
-                return False
-            
             # MP3 files
-            if isinstance(audio_file, MP3) or file_path.lower().endswith('.mp3'):
-                return self._write_mp3_tags(file_path, tags, encoding)
+            if ext == '.mp3':
+                try:
+                    audio_file = ID3(file_path)
+                except ID3NoHeaderError:
+                    audio_file = ID3()
+                return self._write_mp3_tags(audio_file, file_path, tags, encoding)
             
             # FLAC files
-            elif isinstance(audio_file, FLAC) or file_path.lower().endswith('.flac'):
-                return self._write_flac_tags(audio_file, tags, encoding)
+            elif ext == '.flac':
+                return self._write_flac_tags(FLAC(file_path), file_path, tags, encoding)
             
             # MP4/M4A files
-            elif isinstance(audio_file, MP4) or file_path.lower().endswith(('.m4a', '.mp4')):
-                return self._write_mp4_tags(audio_file, tags, encoding)
+            elif ext in ('.m4a', '.mp4'):
+                return self._write_mp4_tags(MP4(file_path), file_path, tags, encoding)
             
-            # Generic fallback
-            return self._write_generic_tags(audio_file, tags, encoding)
+            # Generic fallback - only unknown extensions need format sniffing
+            audio_file = MutagenFile(file_path)
+            if audio_file is None:
+                return False
+            return self._write_generic_tags(audio_file, file_path, tags, encoding)
             
         except Exception as e:
             return False
     
-    def _write_mp3_tags(self, file_path: str, tags: Dict[str, Any], encoding: str) -> bool:
-        """Write MP3 tags using ID3v2.4"""
+    def _write_parsed(self, audio_file: Any, file_path: str, tags: Dict[str, Any], encoding: str) -> bool:
+        """Write tags to an already-parsed mutagen file object"""
         try:
-            try:
-                audio_file = ID3(file_path)
-            except ID3NoHeaderError:
-                audio_file = ID3()
-            
-            # Title
-            if 'title' in tags and tags['title']:
-                audio_file['TIT2'] = TIT2(encoding=3, text=tags['title'])
-            
-            # Artist
-            if 'artist' in tags and tags['artist']:
-                audio_file['TPE1'] = TPE1(encoding=3, text=tags['artist'])
-            
-            # Album
-            if 'album' in tags and tags['album']:
-                audio_file['TALB'] = TALB(encoding=3, text=tags['album'])
-            
-            # Year/Date
-            if 'year' in tags and tags['year']:
-                audio_file['TDRC'] = TDRC(encoding=3, text=str(tags['year']))
-            
-            # Track number
-            if 'track' in tags and tags['track']:
-                audio_file['TRCK'] = TRCK(encoding=3, text=str(tags['track']))
-            
-            # Genre
-            if 'genre' in tags and tags['genre']:
-                audio_file['TCON'] = TCON(encoding=3, text=tags['genre'])
-            
-            # Album Artist
-            if 'albumartist' in tags and tags['albumartist']:
-                audio_file['TPE2'] = TPE2(encoding=3, text=tags['albumartist'])
+            if isinstance(audio_file, MP3):
+                id3 = audio_file.tags if audio_file.tags is not None else ID3()
+                return self._write_mp3_tags(id3, file_path, tags, encoding)
+            elif isinstance(audio_file, FLAC):
+                return self._write_flac_tags(audio_file, file_path, tags, encoding)
+            elif isinstance(audio_file, MP4):
+                return self._write_mp4_tags(audio_file, file_path, tags, encoding)
+            return self._write_generic_tags(audio_file, file_path, tags, encoding)
+        except Exception:
+            return False
+    
+    def _write_mp3_tags(self, audio_file: ID3, file_path: str, tags: Dict[str, Any], encoding: str) -> bool:
+        """Write MP3 tags using ID3v2.4 to an already-loaded ID3 tag"""
+        try:
+            for key, frame_id, frame_cls in _MP3_FRAMES:
+                value = tags.get(key)
+                if value:
+                    audio_file[frame_id] = frame_cls(encoding=3, text=str(value))
             
-            audio_file.save(file_path, v2_version=4)
+            audio_file.save(file_path, v2_version=4, padding=_tag_padding)
             return True
             
         except Exception:
             return False
     
-    def _write_flac_tags(self, audio_file: FLAC, tags: Dict[str, Any], encoding: str) -> bool:
+    def _write_flac_tags(self, audio_file: FLAC, file_path: str, tags: Dict[str, Any], encoding: str) -> bool:
         """Write FLAC tags"""
         try:
-            if 'title' in tags and tags['title']:
-                audio_file['TITLE'] = [tags['title']]
-            if 'artist' in tags and tags['artist']:
-                audio_file['ARTIST'] = [tags['artist']]
-            if 'album' in tags and tags['album']:
-                audio_file['ALBUM'] = [tags['album']]
-            if 'date' in tags and tags['date']:
-                audio_file['DATE'] = [str(tags['date'])]
-            elif 'year' in tags and tags['year']:
-                audio_file['DATE'] = [str(tags['year'])]
-            if 'track' in tags and tags['track']:
-                audio_file['TRACKNUMBER'] = [str(tags['track'])]
-            if 'genre' in tags and tags['genre']:
-                audio_file['GENRE'] = [tags['genre']]
-            if 'albumartist' in tags and tags['albumartist']:
-                audio_file['ALBUMARTIST'] = [tags['albumartist']]
+            for key, field in _FLAC_FIELDS:
+                value = tags.get(key)
+                if value:
+                    audio_file[field] = [str(value)]
             
-            audio_file.save()
+            date = tags.get('date') or tags.get('year')
+            if date:
+                audio_file['DATE'] = [str(date)]
+            
+            audio_file.save(file_path, padding=_tag_padding)
             return True
         except Exception:
             return False
     
-    def _write_mp4_tags(self, audio_file: MP4, tags: Dict[str, Any], encoding: str) -> bool:
+    def _write_mp4_tags(self, audio_file: MP4, file_path: str, tags: Dict[str, Any], encoding: str) -> bool:
         """Write MP4/M4A tags"""
         try:
-            if 'title' in tags and tags['title']:
-                audio_file['\xa9nam'] = [tags['title']]
-            if 'artist' in tags and tags['artist']:
-                audio_file['\xa9ART'] = [tags['artist']]
-            if 'album' in tags and tags['album']:
-                audio_file['\xa9alb'] = [tags['album']]
-            if 'date' in tags and tags['date']:
-                audio_file['\xa9day'] = [str(tags['date'])]
-            elif 'year' in tags and tags['year']:
-                audio_file['\xa9day'] = [str(tags['year'])]
-            if 'track' in tags and tags['track']:
-                track_num = int(tags['track']) if str(tags['track']).isdigit() else 0
+            for key, atom in _MP4_ATOMS:
+                value = tags.get(key)
+                if value:
+                    audio_file[atom] = [str(value)]
+            
+            date = tags.get('date') or tags.get('year')
+            if date:
+                audio_file['\xa9day'] = [str(date)]
+            
+            track = tags.get('track')
+            if track:
+                track_num = int(track) if str(track).isdigit() else 0
                 audio_file['trkn'] = [(track_num, 0)]
-            if 'genre' in tags and tags['genre']:
-                audio_file['\xa9gen'] = [tags['genre']]
-            if 'albumartist' in tags and tags['albumartist']:
-                audio_file['aART'] = [tags['albumartist']]
             
-            audio_file.save()
+            audio_file.save(file_path, padding=_tag_padding)
             return True
         except Exception:
             return False
     
-    def _write_generic_tags(self, audio_file: Any, tags: Dict[str, Any], encoding: str) -> bool:
+    def _write_generic_tags(self, audio_file: Any, file_path: str, tags: Dict[str, Any], encoding: str) -> bool:
         """Write generic tags (fallback)"""
         try:
-            tag_map = {
-                'title': 'title',
-                'artist': 'artist',
-                'album': 'album',
-                'year': 'date',
-                'track': 'tracknumber',
-                'genre': 'genre',
-                'albumartist': 'albumartist'
-            }
-            
-            for key, value in tags.items():
-                if key in tag_map and value:
-                    tag_key = tag_map[key]
-                    if tag_key in audio_file:
-                        audio_file[tag_key] = [str(value)]
+            for key, tag_key in _GENERIC_FIELDS:
+                value = tags.get(key)
+                if value and tag_key in audio_file:
+                    audio_file[tag_key] = [str(value)]
             
-            audio_file.save()
+            audio_file.save(file_path)
             return True
         except Exception:
             return False
-
-
@@ -1,13 +1,19 @@
 """
 Chat handler - event handling
 """
+import queue
 import tkinter as tk
 from typing import Optional
 from threading import Thread
+from pkg.api.ollama import CancelEvent
 from internal.chat.service import ChatService
 from internal.chat.ui import ChatUI
 
 
+# Interval between response chunk drains (~30 Hz)
+CHUNK_INTERVAL_MS = 33
+
+
 class ChatHandler:
     """Chat event handler"""
     
@@ -22,10 +28,19 @@ class ChatHandler:
         self.service = service
         self.ui = ui
         self.is_generating = False
+        # Set to stop the response currently being generated; setting it also
+        # aborts the stream's connection, so the worker is freed right away
+        self._cancel = CancelEvent()
+        # Pending (message, model, chunk_q, cancel) requests for the worker;
+        # one slot, so a message sent while a stopped response is still
+        # winding down waits (briefly, since its stream is aborted) instead of
+        # running concurrently
+        self._requests: queue.Queue = queue.Queue(maxsize=1)
+        Thread(target=self._worker, daemon=True).start()
 
     def on_send(self, event=None):
         """Handle send button click or Enter key"""
-        if self.is_generating:
+        if self.is_generating or self._requests.full():
             return
 
         message = self.ui.get_user_input()
@@ -42,26 +57,47 @@ class ChatHandler:
         # Display user message
         self.ui.display_user_message(message)
 
-        # Start generating response in background thread
+        # Hand the message to the background worker
         self.is_generating = True
         self.ui.set_generating(True)
-        Thread(target=self._generate_response, args=(message, model), daemon=True).start()
+        # A stopped response may still be winding down; make sure it ends now
+        self._cancel.set()
+        self._cancel = CancelEvent()
+        # The response label is created here, on the Tk thread, so chunks of
+        # this response never land in a label created for a later message
+        label = self.ui.start_response(model)
+        chunk_q: queue.Queue = queue.Queue()
+        self.ui.root.after(CHUNK_INTERVAL_MS, self._drain_chunks, chunk_q, label)
+        self._requests.put_nowait((message, model, chunk_q, self._cancel))
+
+    def _worker(self):
+        """Background worker - generate responses one request at a time"""
+        while True:
+            message, model, chunk_q, cancel = self._requests.get()
+            if cancel.is_set():
+                # Stopped before it started
+                chunk_q.put(None)
+                continue
+            self._generate_response(message, model, chunk_q, cancel)
 
-    def _generate_response(self, message: str, model: str):
-        """Generate AI response in background thread"""
+    def _generate_response(self, message: str, model: str, chunk_q: queue.Queue, cancel: CancelEvent):
+        """
+        Generate AI response on the worker thread
+        
+        Chunks are not shown directly; they are put on chunk_q and shown by
+        _drain_chunks in the response's label, followed by None once the
+        response has ended. Setting cancel closes the stream before the next
+        chunk is read.
+        """
         try:
-            # Create response label first
-            self.ui._create_message_label("")
-            self.ui.display_model_name(model)
-            response_content = ""
+            response_parts = []
             
-            for chunk in self.service.send_message(message, model):
-                if not self.is_generating:
-                    break
-                response_content += chunk
-                self.ui.append_response_chunk(chunk)
+            for chunk in self.service.send_message(message, model, cancel):
+                response_parts.append(chunk)
+                chunk_q.put(chunk)
             
             # Add complete response to history
+            response_content = "".join(response_parts)
             if response_content:
                 self.service.add_assistant_message(response_content)
             
@@ -69,11 +105,34 @@ class ChatHandler:
         except Exception as e:
             self.ui.display_error(f"AI error: {e}")
         finally:
-            self.is_generating = False
-            self.ui.set_generating(False)
+            chunk_q.put(None)
+            # A newer message may already be waiting; leave its state alone
+            if cancel is self._cancel:
+                self.is_generating = False
+                self.ui.set_generating(False)
+
+    def _drain_chunks(self, chunk_q: queue.Queue, label: tk.Label):
+        """Show all queued chunks in label with one update, then re-arm until the end marker"""
+        chunks = []
+        done = False
+        while True:
+            try:
+                chunk = chunk_q.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                done = True
+                break
+            chunks.append(chunk)
+        
+        if chunks:
+            self.ui.append_response_chunk(label, ''.join(chunks))
+        if not done:
+            self.ui.root.after(CHUNK_INTERVAL_MS, self._drain_chunks, chunk_q, label)
 
     def on_stop(self):
         """Handle stop button click"""
+        self._cancel.set()
         self.is_generating = False
         self.ui.set_generating(False)
 
@@ -82,12 +141,13 @@ class ChatHandler:
         self.service.clear_history()
         self.ui.clear_chat()
 
-    def handle_key_press(self, event: tk.Event):
-        """Handle keyboard events"""
-        if event.keysym == "Return":
-            if event.state & 0x1 == 0x1:  # Shift key pressed
-                self.ui.insert_newline()
-            else:
-                self.on_send()
-            return "break"
+    def on_return(self, event: tk.Event):
+        """Handle <Return> in the input: send the message"""
+        self.on_send()
+        return "break"
+
+    def on_shift_return(self, event: tk.Event):
+        """Handle <Shift-Return> in the input: insert a new line"""
+        self.ui.insert_newline()
+        return "break"
 
@@ -1,12 +1,56 @@
 """
 Model management window
 """
+import queue
 import tkinter as tk
 from tkinter import ttk
 import webbrowser
-from threading import Thread
-from typing import Optional
+from threading import BoundedSemaphore, Thread
+from typing import List, Optional
 from pkg.api.ollama import OllamaClient
+from pkg.utils.cache import ttl_cache
+from pkg.utils.executor import IO_POOL
+
+
+# Interval between log queue drains in the model management window
+LOG_INTERVAL_MS = 50
+
+# Prefix of the "ollama run <model>" command copied from the model library
+RUN_COMMAND_PREFIX = "ollama run "
+
+# Most model downloads run at once; further names wait for a free slot
+MAX_PARALLEL_DOWNLOADS = 3
+
+_download_slots = BoundedSemaphore(MAX_PARALLEL_DOWNLOADS)
+
+
+@ttl_cache(seconds=30)
+def _fetch_models_for(api_url: str, connect_timeout: float, read_timeout: float) -> List[str]:
+    """Fetch models from an Ollama host; failures return [] and are not cached"""
+    return OllamaClient(api_url, connect_timeout, read_timeout).fetch_models()
+
+
+def _invalidate_models(api_url: str):
+    """Drop cached model lists of a host, whatever client settings fetched them"""
+    for args in list(_fetch_models_for.cache):
+        if args[0] == api_url:
+            _fetch_models_for.invalidate(*args)
+
+
+def fetch_models(api_client: OllamaClient, force: bool = False) -> List[str]:
+    """
+    Fetch available models, reusing a result from the last 30 seconds
+    
+    Args:
+        api_client: Ollama API client
+        force: Skip the cache and ask the host again
+        
+    Returns:
+        List of model names
+    """
+    if force:
+        _invalidate_models(api_client.api_url)
+    return _fetch_models_for(api_client.api_url, api_client.connect_timeout, api_client.read_timeout)
 
 
 class ModelManager:
@@ -27,10 +71,15 @@ class ModelManager:
         self.log_textbox: Optional[tk.Text] = None
         self.download_button: Optional[ttk.Button] = None
         self.delete_button: Optional[ttk.Button] = None
+        # (message, clear) log entries from background threads, shown by _drain_log_queue
+        self._log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Downloads started from the entry that haven't finished yet (Tk thread only)
+        self._downloads = 0
 
     def show_window(self):
         """Show model management window"""
         if self.management_window and self.management_window.winfo_exists():
+            self.management_window.deiconify()
             self.management_window.lift()
             return
 
@@ -54,8 +103,9 @@ class ModelManager:
         self._create_model_list()
         self._create_log_section()
 
-        # Update model list
-        Thread(target=self._update_model_list, daemon=True).start()
+        # Show background log messages, then update model list
+        self.management_window.after(LOG_INTERVAL_MS, self._drain_log_queue, self.management_window)
+        IO_POOL.submit(self._update_model_list)
 
     def _create_download_section(self):
         """Create download section"""
@@ -68,10 +118,21 @@ class ModelManager:
 
         def _download():
             arg = model_name_input.get().strip()
-            if arg.startswith("ollama run "):
-                arg = arg[11:]
-            if arg:
-                Thread(target=self._download_model, daemon=True, args=(arg,)).start()
+            if arg.startswith(RUN_COMMAND_PREFIX):
+                arg = arg[len(RUN_COMMAND_PREFIX):].strip()
+            # Several space-separated names are downloaded side by side
+            names = arg.split()
+            if not names:
+                return
+            self._downloads += len(names)
+            self.download_button.state(["disabled"])
+            self._queue_log("", clear=True)
+            for name in names:
+                # Downloads can run for minutes; a daemon thread keeps one
+                # in progress from holding up application exit, which the
+                # pool's worker threads would
+                Thread(target=self._download_model, daemon=True,
+                       args=(name, len(names) > 1)).start()
 
         self.download_button = ttk.Button(frame, text="Download", command=_download)
         self.download_button.grid(row=0, column=1, sticky="ew")
@@ -105,7 +166,7 @@ class ModelManager:
             selection = self.models_list.curselection()
             if selection:
                 model_name = self.models_list.get(selection[0]).strip()
-                Thread(target=self._delete_model, daemon=True, args=(model_name,)).start()
+                IO_POOL.submit(self._delete_model, model_name)
 
         self.delete_button = ttk.Button(list_action_frame, text="Delete", command=_delete)
         self.delete_button.grid(row=0, column=2, sticky="ew", padx=(5, 0))
@@ -127,58 +188,98 @@ class ModelManager:
             self.log_textbox.config(state=tk.DISABLED)
             self.log_textbox.see(tk.END)
 
+    def _queue_log(self, message: str, clear: bool = False):
+        """Queue a log message from a background thread"""
+        self._log_queue.put((message, clear))
+
+    def _drain_log_queue(self, window: tk.Toplevel):
+        """Show all queued log messages with one widget update, then re-arm while window is open"""
+        if window is not self.management_window or not window.winfo_exists():
+            return
+
+        lines = []
+        clear = False
+        while True:
+            try:
+                message, clear_log = self._log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if clear_log:
+                # Anything queued before the clear would be wiped anyway
+                lines.clear()
+                clear = True
+            if message:
+                lines.append(message)
+
+        if lines or clear:
+            self._append_log("\n".join(lines), clear=clear)
+        window.after(LOG_INTERVAL_MS, self._drain_log_queue, window)
+
     def _update_model_list(self):
         """Update model list in background thread"""
         try:
-            models = self.api_client.fetch_models()
+            models = fetch_models(self.api_client)
             if self.models_list and self.models_list.winfo_exists():
                 self.management_window.after(0, lambda: self._refresh_model_list(models))
         except Exception:
             if self.management_window:
-                self.management_window.after(0, lambda: self._append_log("Error! Please check the Ollama host."))
+                self._queue_log("Error! Please check the Ollama host.")
 
     def _refresh_model_list(self, models: list):
         """Refresh model list UI"""
         if self.models_list:
+            # Cached refreshes usually return the same list; leave it untouched
+            if list(self.models_list.get(0, tk.END)) == list(models):
+                return
             self.models_list.delete(0, tk.END)
-            for model in models:
-                self.models_list.insert(tk.END, model)
-
-    def _download_model(self, model_name: str):
-        """Download model in background thread"""
-        if not model_name:
-            return
+            self.models_list.insert(tk.END, *models)
 
-        if self.download_button:
-            self.management_window.after(0, lambda: self.download_button.state(["disabled"]))
+    def _download_model(self, model_name: str, tagged: bool = False):
+        """
+        Download model in background thread
         
-        self.management_window.after(0, lambda: self._append_log("", clear=True))
-
+        Waits for one of MAX_PARALLEL_DOWNLOADS slots first.
+        
+        Args:
+            model_name: Name of model to download
+            tagged: Prefix log lines with the model name (several downloads share the log)
+        """
+        prefix = f"{model_name}: " if tagged else ""
         try:
-            for log_msg in self.api_client.download_model(model_name):
-                self.management_window.after(0, lambda msg=log_msg: self._append_log(msg))
+            with _download_slots:
+                for log_msg in self.api_client.download_model(model_name):
+                    self._queue_log(prefix + log_msg)
         except Exception as e:
-            self.management_window.after(0, lambda: self._append_log(f"Failed to download model: {e}"))
+            self._queue_log(f"{prefix}Failed to download model: {e}")
         finally:
+            _invalidate_models(self.api_client.api_url)
             self._update_model_list()
-            if self.download_button:
-                self.management_window.after(0, lambda: self.download_button.state(["!disabled"]))
+            if self.management_window:
+                self.management_window.after(0, self._on_download_done)
+
+    def _on_download_done(self):
+        """Re-enable the download button once the last running download ends"""
+        self._downloads -= 1
+        if self._downloads <= 0 and self.download_button and self.download_button.winfo_exists():
+            self._downloads = 0
+            self.download_button.state(["!disabled"])
 
     def _delete_model(self, model_name: str):
         """Delete model in background thread"""
         if not model_name:
             return
 
-        self.management_window.after(0, lambda: self._append_log("", clear=True))
+        self._queue_log("", clear=True)
 
         try:
             success = self.api_client.delete_model(model_name)
             if success:
-                self.management_window.after(0, lambda: self._append_log("Model deleted successfully."))
+                self._queue_log("Model deleted successfully.")
             else:
-                self.management_window.after(0, lambda: self._append_log("Model not found."))
+                self._queue_log("Model not found.")
         except Exception as e:
-            self.management_window.after(0, lambda: self._append_log(f"Failed to delete model: {e}"))
+            self._queue_log(f"Failed to delete model: {e}")
         finally:
+            _invalidate_models(self.api_client.api_url)
             self._update_model_list()
 
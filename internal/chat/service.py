@@ -1,7 +1,8 @@
 """
 Chat service - business logic
 """
-from typing import List, Generator
+from threading import Event
+from typing import List, Generator, Optional
 from internal.model.chat import ChatHistory, ChatMessage
 from pkg.api.ollama import OllamaClient
 
@@ -19,13 +20,15 @@ class ChatService:
         self.api = api_client
         self.history = ChatHistory(messages=[])
 
-    def send_message(self, content: str, model: str) -> Generator[str, None, None]:
+    def send_message(self, content: str, model: str,
+                     cancel: Optional[Event] = None) -> Generator[str, None, None]:
         """
         Send message and get streaming response
         
         Args:
             content: User message content
             model: Model name to use
+            cancel: When set, the stream is closed before the next chunk
             
         Yields:
             Response content chunks
@@ -34,8 +37,9 @@ class ChatService:
         user_msg = ChatMessage(role="user", content=content)
         self.history.add_message(user_msg)
 
-        # Stream response from API
-        for chunk in self.api.chat_stream(model, self.history.to_api_format()):
+        # Stream response from API; the history keeps its API format up to
+        # date, so a send doesn't rebuild it from every message
+        for chunk in self.api.chat_stream(model, self.history.to_api_format(), cancel):
             yield chunk
 
     def add_assistant_message(self, content: str):
@@ -4,7 +4,14 @@ Chat UI components
 import platform
 import tkinter as tk
 from tkinter import ttk, font
-from typing import List
+from typing import Dict, List, Optional
+from internal.ui.components import PROGRESS_INTERVAL_MS
+
+
+# Delay before rewrapping labels after the chat box is resized
+RESIZE_DELAY_MS = 50
+# Width changes smaller than this (in pixels) do not rewrap labels
+RESIZE_MIN_DELTA = 4
 
 
 class ChatUI:
@@ -19,7 +26,17 @@ class ChatUI:
         """
         self.root = parent
         self.default_font = font.nametofont("TkTextFont").actual()["family"]
+        # Named fonts, created once and shared by every message label
+        self._msg_font = font.Font(family=self.default_font, size=12)
+        self._bold_font = font.Font(family=self.default_font, size=10, weight="bold")
         self.label_widgets: List[tk.Label] = []
+        # Oldest messages beyond this many are removed from the chat box
+        self.max_labels = 200
+        # Text shown by each label, so appends never read it back from Tk
+        self._label_text: Dict[tk.Label, str] = {}
+        # Pending wraplength update and the chat box width it was applied for
+        self._resize_after: Optional[str] = None
+        self._last_width = 0
         
         # UI components
         self.chat_box: tk.Text = None
@@ -44,7 +61,7 @@ class ChatUI:
             chat_frame,
             wrap=tk.WORD,
             state=tk.DISABLED,
-            font=(self.default_font, 12),
+            font=self._msg_font,
             spacing1=5,
             highlightthickness=0,
         )
@@ -56,7 +73,7 @@ class ChatUI:
         self.chat_box.configure(yscrollcommand=scrollbar.set)
 
         # Configure text tags
-        self.chat_box.tag_configure("Bold", foreground="#ff007b", font=(self.default_font, 10, "bold"))
+        self.chat_box.tag_configure("Bold", foreground="#ff007b", font=self._bold_font)
         self.chat_box.tag_configure("Error", foreground="red")
         self.chat_box.tag_configure("Right", justify="right")
 
@@ -64,10 +81,26 @@ class ChatUI:
         self.chat_box.bind("<Configure>", self._resize_labels)
 
     def _resize_labels(self, event: tk.Event):
-        """Resize label widgets when chat box is resized"""
+        """
+        Resize label widgets when chat box is resized
+        
+        <Configure> fires for every pixel of a drag; the labels are rewrapped
+        once the width has been stable for RESIZE_DELAY_MS.
+        """
+        width = event.widget.winfo_width()
+        if abs(width - self._last_width) < RESIZE_MIN_DELTA:
+            return
+        
+        if self._resize_after is not None:
+            self.root.after_cancel(self._resize_after)
+        self._resize_after = self.root.after(RESIZE_DELAY_MS, self._apply_wraplength, width)
+
+    def _apply_wraplength(self, width: int):
+        """Set wraplength of all label widgets for a chat box width"""
+        self._resize_after = None
+        self._last_width = width
+        max_width = int(width) * 0.7
         for label in self.label_widgets:
-            current_width = event.widget.winfo_width()
-            max_width = int(current_width) * 0.7
             label.config(wraplength=max_width)
 
     def display_user_message(self, message: str):
@@ -79,20 +112,47 @@ class ChatUI:
         """Display model name"""
         self._append_text(f"{model}\n", ("Bold",))
 
-    def append_response_chunk(self, chunk: str):
-        """Append response chunk"""
+    def start_response(self, model: str) -> tk.Label:
+        """
+        Create the label a response is shown in, followed by the model name
+        
+        Returns:
+            The new label, to pass to append_response_chunk
+        """
+        label = self._create_message_label("")
+        self.display_model_name(model)
+        return label
+
+    def append_response_chunk(self, label: tk.Label, chunk: str):
+        """
+        Append response chunk to a response label
+        
+        Args:
+            label: Label returned by start_response
+            chunk: Text to append
+        """
+        if label not in self._label_text:
+            # Evicted or cleared while the response was streaming
+            return
+        text = self._label_text[label] + chunk
+        self._label_text[label] = text
+        label.config(text=text)
+
+    def get_current_text(self) -> str:
+        """Get text of the most recent message label"""
         if self.label_widgets:
-            current_label = self.label_widgets[-1]
-            current_label.config(text=current_label.cget("text") + chunk)
-        else:
-            self._create_message_label("")
-            self.label_widgets[-1].config(text=chunk)
+            return self._label_text[self.label_widgets[-1]]
+        return ""
 
-    def _create_message_label(self, text: str, on_right_side: bool = False):
+    def _create_message_label(self, text: str, on_right_side: bool = False) -> tk.Label:
         """Create a message label"""
+        while len(self.label_widgets) >= self.max_labels:
+            self._evict_oldest_label()
+        
         background = "#48a4f2" if on_right_side else "#eaeaea"
         foreground = "white" if on_right_side else "black"
-        max_width = int(self.chat_box.winfo_reqwidth()) * 0.7 if self.chat_box.winfo_reqwidth() > 0 else 500
+        # Width from the last resize, so creating a label needs no geometry query
+        max_width = self._last_width * 0.7 if self._last_width > 0 else 500
         
         label = tk.Label(
             self.chat_box,
@@ -104,11 +164,12 @@ class ChatUI:
             foreground=foreground,
             padx=8,
             pady=8,
-            font=(self.default_font, 12),
+            font=self._msg_font,
             borderwidth=0,
         )
         label.config(text=text)
         self.label_widgets.append(label)
+        self._label_text[label] = text
         
         self.chat_box.config(state=tk.NORMAL)
         self.chat_box.window_create(tk.END, window=label)
@@ -117,13 +178,34 @@ class ChatUI:
         if on_right_side:
             idx = self.chat_box.index("end-1c").split(".")[0]
             self.chat_box.tag_add("Right", f"{idx}.0", f"{idx}.end")
+        
+        return label
+
+    def _evict_oldest_label(self):
+        """
+        Remove the oldest message label and the text that follows it
+        
+        Everything up to the next label belongs to the oldest message (model
+        name, separators, errors), so that whole range is deleted.
+        """
+        oldest = self.label_widgets.pop(0)
+        self._label_text.pop(oldest, None)
+        
+        # An embedded window's path name is a valid text index
+        end = self.chat_box.index(self.label_widgets[0]) if self.label_widgets else tk.END
+        self.chat_box.config(state=tk.NORMAL)
+        self.chat_box.delete("1.0", end)
+        self.chat_box.config(state=tk.DISABLED)
+        oldest.destroy()
 
     def _append_text(self, text: str, tags=()):
-        """Append text to chat box"""
+        """Append text to chat box, following the end only if it was in view"""
+        at_bottom = self.chat_box.yview()[1] >= 0.999
         self.chat_box.config(state=tk.NORMAL)
         self.chat_box.insert(tk.END, text, tags)
-        self.chat_box.see(tk.END)
         self.chat_box.config(state=tk.DISABLED)
+        if at_bottom:
+            self.chat_box.see(tk.END)
 
     def append_newline(self):
         """Append newline"""
@@ -135,9 +217,15 @@ class ChatUI:
 
     def clear_chat(self):
         """Clear chat display"""
-        for label in self.label_widgets:
-            label.destroy()
+        if self.label_widgets:
+            # One Tcl destroy for every label instead of one round-trip each;
+            # then drop tkinter's references to the destroyed widgets
+            self.chat_box.tk.call("destroy", *self.label_widgets)
+            children = self.chat_box.children
+            for label in self.label_widgets:
+                children.pop(str(label).rpartition(".")[2], None)
         self.label_widgets.clear()
+        self._label_text.clear()
         self.chat_box.config(state=tk.NORMAL)
         self.chat_box.delete(1.0, tk.END)
         self.chat_box.config(state=tk.DISABLED)
@@ -169,7 +257,7 @@ class ChatUI:
         if generating:
             if self.progress:
                 self.progress.grid(row=0, column=0, sticky="nsew")
-                self.progress.start(5)
+                self.progress.start(PROGRESS_INTERVAL_MS)
             if self.stop_button:
                 self.stop_button.grid(row=0, column=1, padx=20)
             if self.send_button:
@@ -2,23 +2,33 @@
 Chat window - independent window
 """
 import tkinter as tk
+import weakref
 from tkinter import ttk, messagebox
+from concurrent.futures import Future
 from typing import Optional
-from threading import Thread
 from pkg.api.ollama import OllamaClient
+from pkg.utils.executor import IO_POOL
 from pkg.utils.system import check_system_compatibility
 from internal.model.config import AppConfig
 from internal.chat.service import ChatService
 from internal.chat.handler import ChatHandler
 from internal.chat.ui import ChatUI
-from internal.chat.model_manager import ModelManager
+from internal.chat.model_manager import ModelManager, fetch_models
 from internal.ui.components import HeaderFrame, InputFrame, ProgressFrame
 
 
+# Model list refresh requests within this delay are coalesced into one (ms)
+MODELS_REFRESH_DELAY_MS = 150
+# How often a running model list fetch is checked for completion (ms)
+MODELS_POLL_MS = 50
+
+
 class ChatWindow:
     """Independent chat window"""
     
-    _instances = {}  # Track open windows by parent
+    # Track open windows by parent. The value's window refers to the parent via
+    # its master, so weak keys alone never drop an entry; _on_destroy pops it
+    _instances: "weakref.WeakKeyDictionary[tk.Misc, ChatWindow]" = weakref.WeakKeyDictionary()
     
     def __init__(self, parent: tk.Tk, api_client: OllamaClient):
         """
@@ -32,7 +42,7 @@ class ChatWindow:
         if parent in ChatWindow._instances:
             existing = ChatWindow._instances[parent]
             if existing.window.winfo_exists():
-                existing.window.lift()
+                existing.show()
                 return
         
         self.window = tk.Toplevel(parent)
@@ -44,25 +54,43 @@ class ChatWindow:
         self.input_frame: Optional[InputFrame] = None
         self.progress_frame: Optional[ProgressFrame] = None
         self.model_manager: Optional[ModelManager] = None
+        # Model list refresh: running fetch, pending debounced start, and
+        # whether another fetch (and with what force) is needed after it
+        self._models_future: Optional[Future] = None
+        self._models_after = None
+        self._models_rerun: Optional[bool] = None
+        self._models_after_force = False
         
         # Store instance
         ChatWindow._instances[parent] = self
         
-        # Handle window close
+        # Handle window close; destroying the window (or its parent) forgets it
         self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.window.bind("<Destroy>", self._on_destroy, add="+")
         
         self._create_window()
         self._setup_components()
     
+    def show(self):
+        """Show the window again after it was closed, or raise it"""
+        self.window.deiconify()
+        self.window.lift()
+        # Models may have changed while hidden; a recent list comes from the cache
+        self._refresh_models()
+    
     def _on_close(self):
-        """Handle window close"""
+        """Handle window close - hide, keeping the window and chat for the next show"""
         if self.window.winfo_exists():
-            # Remove from instances
-            for key, instance in list(ChatWindow._instances.items()):
-                if instance == self:
-                    del ChatWindow._instances[key]
-                    break
-            self.window.destroy()
+            self.window.withdraw()
+    
+    def _on_destroy(self, event: tk.Event):
+        """Remove this window from _instances once it is destroyed"""
+        # A Toplevel's bindings also see its children being destroyed
+        if event.widget is not self.window:
+            return
+        parent = self.window.master
+        if ChatWindow._instances.get(parent) is self:
+            del ChatWindow._instances[parent]
     
     def _create_window(self):
         """Create chat window"""
@@ -133,9 +161,10 @@ class ChatWindow:
     
     def _setup_event_handlers(self):
         """Setup event handlers"""
-        # User input key binding
+        # User input key bindings; only Return is handled, other keys go straight to Tk
         if self.input_frame and self.input_frame.user_input and self.chat_handler:
-            self.input_frame.user_input.bind("<Key>", self.chat_handler.handle_key_press)
+            self.input_frame.user_input.bind("<Return>", self.chat_handler.on_return)
+            self.input_frame.user_input.bind("<Shift-Return>", self.chat_handler.on_shift_return)
         
         # Send button
         if self.input_frame and self.input_frame.send_button and self.chat_handler:
@@ -147,7 +176,7 @@ class ChatWindow:
         
         # Refresh button (header)
         if self.header and self.header.refresh_button:
-            self.header.refresh_button.config(command=self._refresh_models)
+            self.header.refresh_button.config(command=lambda: self._refresh_models(force=True))
         
         # Host input change
         if self.header and self.header.host_input:
@@ -157,29 +186,71 @@ class ChatWindow:
         """Update API client host"""
         if self.header and self.api_client:
             new_host = self.header.get_host()
+            # Enter on an unchanged host is a no-op; the refresh button re-fetches
+            if new_host == self.api_client.api_url:
+                return
             self.api_client.api_url = new_host
             if self.model_manager:
                 self.model_manager.api_client.api_url = new_host
             self._refresh_models()
     
-    def _refresh_models(self):
-        """Refresh model list"""
+    def _refresh_models(self, force: bool = False):
+        """
+        Refresh model list
+        
+        Bursts of requests (typing the host, repeated clicks) are coalesced,
+        and only one fetch runs at a time.
+        
+        Args:
+            force: Ask the host again even if a recent model list is cached
+        """
         if not self.header or not self.api_client:
             return
         
-        def update_models():
-            try:
-                models = self.api_client.fetch_models()
-                if models:
-                    self.window.after(0, lambda: self.header.set_models(models))
-                    if self.input_frame:
-                        self.window.after(0, lambda: self.input_frame.send_button.state(["!disabled"]))
-                else:
-                    self.window.after(0, lambda: self.header.model_select.set("No models available"))
-            except Exception:
-                self.window.after(0, lambda: self.header.model_select.set("Error! Check host."))
-        
-        Thread(target=update_models, daemon=True).start()
+        if self._models_after is not None:
+            self.window.after_cancel(self._models_after)
+            force = force or self._models_after_force
+        self._models_after_force = force
+        self._models_after = self.window.after(MODELS_REFRESH_DELAY_MS, self._start_models_fetch, force)
+
+    def _start_models_fetch(self, force: bool):
+        """Start fetching the model list, or queue a fetch behind a running one"""
+        self._models_after = None
+        if self._models_future is not None:
+            self._models_rerun = bool(self._models_rerun) or force
+            return
+        self._models_future = IO_POOL.submit(fetch_models, self.api_client, force)
+        self._watch_models_fetch()
+
+    def _watch_models_fetch(self):
+        """Poll the model list fetch from the Tk loop and show its result"""
+        if not self.window.winfo_exists():
+            return
+        future = self._models_future
+        if not future.done():
+            self.window.after(MODELS_POLL_MS, self._watch_models_fetch)
+            return
+        self._models_future = None
+        
+        # A request arrived while fetching (e.g. the host changed); this
+        # result may be stale, so fetch again instead of showing it
+        if self._models_rerun is not None:
+            force = self._models_rerun
+            self._models_rerun = None
+            self._start_models_fetch(force)
+            return
+        
+        try:
+            models = future.result()
+        except Exception:
+            self.header.model_select.set("Error! Check host.")
+            return
+        if models:
+            self.header.set_models(models)
+            if self.input_frame:
+                self.input_frame.send_button.state(["!disabled"])
+        else:
+            self.header.model_select.set("No models available")
     
     def _show_model_management(self):
         """Show model management window"""
@@ -191,7 +262,6 @@ class ChatWindow:
     
     def _check_system(self):
         """Check system compatibility"""
-        from pkg.utils.system import check_system_compatibility
         if self.window:
             message = check_system_compatibility(self.window)
             if message:
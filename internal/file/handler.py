@@ -2,15 +2,30 @@
 File management handler - event handling
 """
 import os
+import time
 import tkinter as tk
+from concurrent.futures import Future
 from tkinter import messagebox
-from internal.file.service import FileService
+from typing import Callable, List, Optional, Tuple
+from internal.file.service import FileService, SEARCH_LIMIT
 from internal.file.ui import FileManagerUI
 
 
+# How long the last search result may be narrowed for a longer query (seconds)
+SEARCH_CACHE_TTL = 5.0
+# Refresh requests arriving within this delay are coalesced into one (ms)
+REFRESH_DELAY_MS = 40
+# Searches wait for a pause in typing this long before running (ms)
+SEARCH_DELAY_MS = 250
+# How often a background paste is checked for completion (ms)
+PASTE_POLL_MS = 100
+
+
 class FileHandler:
     """File management event handler"""
     
+    __slots__ = ('service', 'ui', '_last_search', '_pending_after', '_pending_action', '_search_after')
+    
     def __init__(self, service: FileService, ui: FileManagerUI):
         """
         Initialize file handler
@@ -22,6 +37,14 @@ class FileHandler:
         self.service = service
         self.ui = ui
         self.ui.set_handler(self)
+        # Last search as (path, lowercased query, matching rows, listing time), see on_search
+        self._last_search: Optional[Tuple[str, str, List[Tuple[str, str, str, str]], float]] = None
+        # Pending debounced action and its after() id, see _schedule
+        self._pending_after = None
+        self._pending_action: Optional[Callable[[], None]] = None
+        # after() id of a pending debounced search, kept apart from refreshes
+        # so a refresh doesn't cancel the query being typed
+        self._search_after = None
         
         # Connect UI events
         if self.ui.back_btn:
@@ -31,46 +54,117 @@ class FileHandler:
         if self.ui.refresh_btn:
             self.ui.refresh_btn.config(command=self.on_refresh)
 
+    def _schedule_refresh(self, matches: Optional[List[Tuple[str, str, str, str]]] = None):
+        """
+        Refresh the UI after REFRESH_DELAY_MS, coalescing bursts of requests
+        
+        Only the latest request is kept, so e.g. typing a search query
+        searches and refreshes once for the final text.
+        
+        Args:
+            matches: Search result rows to show instead of the full listing
+        """
+        self._schedule(lambda: self.ui.refresh(matches))
+
+    def _schedule(self, action: Callable[[], None]):
+        """Run action after REFRESH_DELAY_MS, replacing any pending one"""
+        window = self.ui.window
+        if window is None:
+            action()
+            return
+        if self._pending_after is not None:
+            window.after_cancel(self._pending_after)
+        self._pending_action = action
+        self._pending_after = window.after(REFRESH_DELAY_MS, self._run_pending)
+
+    def _run_pending(self):
+        """Run the pending debounced action"""
+        action = self._pending_action
+        self._pending_after = None
+        self._pending_action = None
+        if action is not None:
+            action()
+
     def on_double_click(self, event=None):
         """Handle double click on file/directory"""
         selected = self.ui.get_selected_item()
         if selected:
             if self.service.open_item(selected):
-                self.ui.refresh()
+                self._schedule_refresh()
 
     def on_navigate_back(self):
         """Handle back button"""
         if self.service.navigate_back():
-            self.ui.refresh()
+            self._schedule_refresh()
 
     def on_navigate_forward(self):
         """Handle forward button"""
         if self.service.navigate_forward():
-            self.ui.refresh()
+            self._schedule_refresh()
 
     def on_refresh(self):
         """Handle refresh button"""
-        self.ui.refresh()
+        # An explicit refresh also picks up changes the directory mtime misses,
+        # new drives, and changes in the directory tree
+        self.service.invalidate()
+        self.service.invalidate_drives()
+        self.ui.invalidate_tree()
+        self._schedule_refresh()
 
     def on_search(self, query: str):
-        """Handle search"""
-        if query:
-            matches = self.service.search_files(query)
-            self.ui.refresh(matches)
-        else:
+        """Handle search, debounced so a burst of keystrokes searches once"""
+        window = self.ui.window
+        if window is None:
+            self._search(query)
+            return
+        if self._search_after is not None:
+            window.after_cancel(self._search_after)
+        self._search_after = window.after(SEARCH_DELAY_MS, self._run_search, query)
+
+    def _run_search(self, query: str):
+        """Run the pending debounced search"""
+        self._search_after = None
+        self._search(query)
+
+    def _search(self, query: str):
+        """
+        Run a search and show its matches
+        
+        A query that extends the previous one in the same directory is
+        answered by filtering the previous matches instead of re-listing.
+        """
+        if not query:
+            self._last_search = None
             self.ui.refresh()
+            return
+        
+        path = self.service.current_path
+        query_lower = query.lower()
+        now = time.monotonic()
+        last = self._last_search
+        # A truncated result can't be narrowed, it may be missing matches
+        if (last and last[0] == path and last[1] and query_lower.startswith(last[1])
+                and len(last[2]) < SEARCH_LIMIT and now - last[3] < SEARCH_CACHE_TTL):
+            matches = [item for item in last[2] if query_lower in item[0].lower()]
+            listed_at = last[3]
+        else:
+            matches = list(self.service.search_files(query))
+            listed_at = now
+        
+        self._last_search = (path, query_lower, matches, listed_at)
+        self.ui.refresh(matches)
     
     def on_tree_navigate(self, dir_path: str):
         """Handle directory tree navigation"""
         if self.service.navigate_to(dir_path):
-            self.ui.refresh()
+            self._schedule_refresh()
 
     def on_create_file(self, name: str) -> bool:
         """Handle create file"""
         if not name:
             return False
         if self.service.create_file(name):
-            self.ui.refresh()
+            self._schedule_refresh()
             return True
         return False
 
@@ -80,7 +174,7 @@ class FileHandler:
             return False
         try:
             if self.service.create_directory(name):
-                self.ui.refresh()
+                self._schedule_refresh()
                 return True
             else:
                 messagebox.showerror(
@@ -111,7 +205,7 @@ class FileHandler:
                 # Restore original path
                 self.service.navigate_to(current_path)
                 if success:
-                    self.ui.refresh()
+                    self._schedule_refresh()
                     return True
                 else:
                     messagebox.showerror(
@@ -135,8 +229,7 @@ class FileHandler:
             return False
         
         # Check if it's a directory or file
-        item_path = os.path.join(self.service.current_path, name)
-        is_dir = os.path.isdir(item_path)
+        is_dir = self.service.is_dir(name)
         item_type = "directory" if is_dir else "file"
         
         result = messagebox.askyesno(
@@ -148,7 +241,7 @@ class FileHandler:
         if result:
             try:
                 if self.service.delete_item(name):
-                    self.ui.refresh()
+                    self._schedule_refresh()
                     return True
                 else:
                     messagebox.showerror(
@@ -175,7 +268,7 @@ class FileHandler:
         
         try:
             if self.service.rename_item(old_name, new_name):
-                self.ui.refresh()
+                self._schedule_refresh()
                 return True
             else:
                 messagebox.showerror(
@@ -198,9 +291,30 @@ class FileHandler:
             self.service.copy_item(name)
 
     def on_paste_item(self):
-        """Handle paste item"""
-        if self.service.paste_item():
-            self.ui.refresh()
+        """Handle paste item; the copy runs in the background"""
+        dest = self.service.current_path
+        future = self.service.paste_item()
+        if future is None:
+            return
+        if self.ui.footer_label:
+            self.ui.footer_label.config(text=f"Pasting {os.path.basename(self.service.copied_path)}...")
+        self._watch_paste(future, dest)
+
+    def _watch_paste(self, future: "Future[bool]", dest: str):
+        """Poll a paste from the Tk loop and refresh once it finishes"""
+        window = self.ui.window
+        if not future.done():
+            if window is not None:
+                window.after(PASTE_POLL_MS, self._watch_paste, future, dest)
+            return
+        self.service.invalidate(dest)
+        if not future.result():
+            messagebox.showerror(
+                "Error",
+                f"Failed to paste into '{dest}'.\nYou may not have permission.",
+                parent=self.ui.window
+            )
+        self._schedule_refresh()
 
     def on_select_item(self, event):
         """Handle item selection"""
@@ -3,21 +3,170 @@ File management service - business logic
 """
 import os
 import shutil
+import stat
 import subprocess
 import platform
-from datetime import datetime
-from typing import List, Tuple, Optional
+import functools
+import itertools
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Tuple, Optional
+from pkg.utils.executor import FILE_POOL
+
+
+# Host OS, looked up once ("Windows", "Linux", "Darwin", ...)
+SYSTEM = platform.system()
+
+# Whether item operations can resolve names against an open directory fd
+USE_DIR_FD = (hasattr(os, "O_DIRECTORY")
+              and {os.open, os.mkdir, os.unlink, os.rename} <= os.supports_dir_fd)
+
+# Date format of the listing's "Date modified" column
+DATE_FORMAT = "%d-%m-%Y %I:%M"
+
+# Number of directory listings kept by FileService
+LIST_CACHE_SIZE = 32
+# How long a cached listing is reused (seconds); file sizes and dates can
+# change without touching the directory's mtime, so they go stale at most this long
+LIST_CACHE_TTL = 5.0
+# Rows per chunk when a listing is displayed incrementally
+LIST_CHUNK_SIZE = 500
+# Maximum number of matches returned by FileService.search_files
+SEARCH_LIMIT = 500
+# How long the drive list is reused (seconds)
+DRIVES_CACHE_TTL = 10.0
+
+# Largest chunk handed to copy_file_range in one call
+COPY_CHUNK_SIZE = 1 << 30
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_mtime(minute: int) -> str:
+    """Format a modification time given in whole minutes since the epoch"""
+    # time.strftime directly; datetime.strftime builds the same struct_time first
+    return time.strftime(DATE_FORMAT, time.localtime(minute * 60))
+
+
+@functools.lru_cache(maxsize=256)
+def _file_type(ext: str) -> str:
+    """Describe a file by its extension (including the dot)"""
+    if ext == "":
+        return "Unknown file"
+    return ext.upper()[1:] + " file"
+
+
+def _extension(name: str) -> str:
+    """
+    Extension of a file name, as os.path.splitext returns it for a bare name
+    
+    Entry names have no separators, so only the dot rules are needed:
+    leading dots (".bashrc") don't start an extension.
+    """
+    dot = name.rfind('.')
+    if dot <= 0 or dot < len(name) - len(name.lstrip('.')):
+        return ""
+    return name[dot:]
+
+
+def _copy_file(src: str, dst: str):
+    """
+    Copy a file with its metadata, like shutil.copy2
+    
+    Where os.copy_file_range exists (Linux), the data is copied in the
+    kernel, which also lets filesystems that support it share extents or
+    copy server-side. Falls back to shutil.copy2 if the kernel or the
+    filesystem pair doesn't support it.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+        
+    Raises:
+        shutil.SameFileError: src and dst are the same file; opening dst for
+            writing would truncate the source
+    """
+    try:
+        same = os.path.samefile(src, dst)
+    except OSError:
+        same = False
+    if same:
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                copied = 0
+                while copied < size:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), min(size - copied, COPY_CHUNK_SIZE))
+                    if n == 0:
+                        break
+                    copied += n
+            if copied == size:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
 
 
 class FileService:
     """File management business logic service"""
     
+    __slots__ = ('current_path', 'last_directory', 'copied_path', 'selected_item',
+                 '_entries', '_list_cache', '_drives_cache', '_dir_fd')
+    
     def __init__(self):
         """Initialize file service"""
         self.current_path = os.getcwd()
         self.last_directory = ""
         self.copied_path = ""  # Source path for copy/paste
         self.selected_item = ""
+        # Entries of the last directory listed, by name; DirEntry caches the type
+        self._entries: Dict[str, os.DirEntry] = {}
+        # path -> (directory st_mtime_ns, time cached, items, entries), least recently used first
+        self._list_cache: "OrderedDict[str, Tuple[int, float, List[Tuple[str, str, str, str]], Dict[str, os.DirEntry]]]" = OrderedDict()
+        self._drives_cache: Optional[Tuple[float, List[str]]] = None
+        # fd of current_path for *at() calls, see _open_dir_fd
+        self._dir_fd: Optional[int] = None
+        self._open_dir_fd()
+
+    def __del__(self):
+        if getattr(self, "_dir_fd", None) is not None:
+            self.close()
+
+    def close(self):
+        """Release the current directory fd"""
+        if self._dir_fd is not None:
+            try:
+                os.close(self._dir_fd)
+            except OSError:
+                pass
+            self._dir_fd = None
+
+    def _open_dir_fd(self):
+        """Reopen the directory fd after current_path changes"""
+        self.close()
+        if USE_DIR_FD:
+            try:
+                self._dir_fd = os.open(self.current_path, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                self._dir_fd = None
+
+    def _at(self, name: str) -> Optional[int]:
+        """
+        Directory fd to resolve name against
+        
+        Resolving a bare name relative to the open directory skips walking
+        current_path again on every call.
+        
+        Returns:
+            The fd, or None to use the joined full path
+        """
+        if self._dir_fd is not None and os.path.basename(name) == name:
+            return self._dir_fd
+        return None
 
     def get_current_path(self) -> str:
         """Get current directory path"""
@@ -30,40 +179,152 @@ class FileService:
         Returns:
             List of tuples: (name, date_modified, file_type, size)
         """
+        return list(self.iter_directory(path))
+
+    def list_directory_chunks(self, path: Optional[str] = None,
+                              chunk_size: int = LIST_CHUNK_SIZE) -> Iterator[List[Tuple[str, str, str, str]]]:
+        """
+        List directory contents in chunks, for incremental display
+        
+        Args:
+            path: Directory path (default: current directory)
+            chunk_size: Maximum number of rows per chunk
+            
+        Yields:
+            Lists of (name, date_modified, file_type, size)
+        """
+        rows = self.iter_directory(path)
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            rows.close()
+
+    def iter_directory(self, path: Optional[str] = None) -> Iterator[Tuple[str, str, str, str]]:
+        """
+        Iterate over directory contents as they are scanned
+        
+        Listings are cached per directory and reused for LIST_CACHE_TTL
+        seconds while the directory's mtime is unchanged. Adding, removing or
+        renaming entries updates it; changes to a file's own size or date do
+        not, so those show up once the entry expires, or right away after
+        invalidate(). A scan is only cached once it has been iterated to the
+        end.
+        
+        Args:
+            path: Directory path (default: current directory)
+            
+        Yields:
+            (name, date_modified, file_type, size)
+        """
         if path is None:
             path = self.current_path
         
         try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            cached = self._cached_listing(path, mtime_ns)
+            if cached is not None:
+                self._list_cache.move_to_end(path)
+                self._entries = cached[3]
+                yield from cached[2]
+                return
+            
             items = []
-            for name in os.listdir(path):
-                item_path = os.path.join(path, name)
-                try:
-                    # Date modified
-                    date_modified = datetime.fromtimestamp(
-                        os.path.getmtime(item_path)
-                    ).strftime("%d-%m-%Y %I:%M")
-                    
-                    # File type
-                    if os.path.isdir(item_path):
-                        file_type = "Directory"
-                        size = ""
-                    else:
-                        ext = os.path.splitext(name)[1]
-                        if ext == "":
-                            file_type = "Unknown file"
-                        else:
-                            file_type = ext.upper()[1:] + " file"
-                        # Size in KB
-                        size_kb = round(os.stat(item_path).st_size / 1024)
-                        size = f"{size_kb} KB"
-                    
-                    items.append((name, date_modified, file_type, size))
-                except Exception:
-                    continue
+            entries = {}
+            self._entries = entries
+            # Bound once, rather than looked up for every entry
+            describe = self._describe_entry
+            append = items.append
+            with os.scandir(path) as it:
+                for entry in it:
+                    entries[entry.name] = entry
+                    item = describe(entry)
+                    if item is not None:
+                        append(item)
+                        yield item
+            
+            self._list_cache[path] = (mtime_ns, time.monotonic(), items, entries)
+            self._list_cache.move_to_end(path)
+            while len(self._list_cache) > LIST_CACHE_SIZE:
+                self._list_cache.popitem(last=False)
+        except OSError:
+            return
+
+    @staticmethod
+    def _describe_entry(entry: os.DirEntry) -> Optional[Tuple[str, str, str, str]]:
+        """
+        Build a list_directory row for a scandir entry
+        
+        Args:
+            entry: Directory entry
+            
+        Returns:
+            (name, date_modified, file_type, size), or None if it can't be stat'ed
+        """
+        name = entry.name
+        try:
+            # One stat per entry, shared by date and size (cached by
+            # DirEntry; free on Windows, where scandir returns it)
+            st = entry.stat()
             
-            return items
-        except Exception:
-            return []
+            # Date modified; shown to the minute, so entries share the formatting
+            date_modified = _format_mtime(int(st.st_mtime) // 60)
+            
+            # File type, from the same stat (which follows symlinks like is_dir)
+            if stat.S_ISDIR(st.st_mode):
+                file_type = "Directory"
+                size = ""
+            else:
+                file_type = _file_type(_extension(name))
+                # Size in KB, rounded to nearest in integer arithmetic
+                size = f"{(st.st_size + 512) >> 10} KB"
+            
+            return (name, date_modified, file_type, size)
+        except (OSError, ValueError, OverflowError):
+            return None
+
+    def _cached_listing(self, path: str, mtime_ns: int):
+        """Cache entry of a directory if it is still valid for this mtime, else None"""
+        cached = self._list_cache.get(path)
+        if cached is None:
+            return None
+        if cached[0] != mtime_ns or time.monotonic() - cached[1] >= LIST_CACHE_TTL:
+            del self._list_cache[path]
+            return None
+        return cached
+
+    def invalidate(self, path: Optional[str] = None):
+        """
+        Drop the cached listing of a directory
+        
+        Args:
+            path: Directory path (default: current directory)
+        """
+        self._list_cache.pop(self.current_path if path is None else path, None)
+
+    def is_dir(self, name: str) -> bool:
+        """
+        Check whether an item in the current directory is a directory
+        
+        Uses the cached entry from the last listing when there is one, so no
+        new stat is needed.
+        
+        Args:
+            name: Item name
+            
+        Returns:
+            True if the item is a directory
+        """
+        entry = self._entries.get(name)
+        if entry is not None and os.path.dirname(entry.path) == self.current_path:
+            try:
+                return entry.is_dir()
+            except OSError:
+                pass
+        return os.path.isdir(os.path.join(self.current_path, name))
 
     def navigate_to(self, path: str) -> bool:
         """
@@ -75,51 +336,41 @@ class FileService:
         Returns:
             True if successful
         """
+        # chdir rejects missing paths and non-directories itself
         try:
-            if os.path.isdir(path):
-                self.last_directory = self.current_path
-                self.current_path = path
-                os.chdir(path)
-                return True
-            return False
-        except Exception:
-            return False
-
-    def navigate_to(self, path: str) -> bool:
-        """Navigate to specified directory"""
-        try:
-            if os.path.isdir(path):
-                self.last_directory = self.current_path
-                self.current_path = path
-                os.chdir(path)
-                return True
-            return False
-        except Exception:
+            os.chdir(path)
+        except OSError:
             return False
+        self.last_directory = self.current_path
+        self.current_path = path
+        self._open_dir_fd()
+        return True
     
     def navigate_back(self) -> bool:
         """Navigate to parent directory"""
-        try:
-            parent = os.path.dirname(self.current_path)
-            if parent != self.current_path:
-                self.last_directory = self.current_path
-                self.current_path = parent
-                os.chdir(parent)
-                return True
+        parent = os.path.dirname(self.current_path)
+        if parent == self.current_path:
             return False
-        except Exception:
+        try:
+            os.chdir(parent)
+        except OSError:
             return False
+        self.last_directory = self.current_path
+        self.current_path = parent
+        self._open_dir_fd()
+        return True
 
     def navigate_forward(self) -> bool:
         """Navigate to last directory"""
-        try:
-            if self.last_directory and os.path.isdir(self.last_directory):
-                self.current_path = self.last_directory
-                os.chdir(self.last_directory)
-                return True
+        if not self.last_directory:
             return False
-        except Exception:
+        try:
+            os.chdir(self.last_directory)
+        except OSError:
             return False
+        self.current_path = self.last_directory
+        self._open_dir_fd()
+        return True
 
     def open_item(self, name: str) -> bool:
         """
@@ -133,102 +384,194 @@ class FileService:
         """
         try:
             item_path = os.path.join(self.current_path, name)
-            if os.path.isdir(item_path):
+            if self.is_dir(name):
                 return self.navigate_to(item_path)
             else:
                 # Open file with system default
-                if platform.system() == "Windows":
+                if SYSTEM == "Windows":
                     os.startfile(item_path)
-                elif platform.system() == "Linux":
-                    subprocess.Popen(["xdg-open", item_path])
+                else:
+                    opener = "open" if SYSTEM == "Darwin" else "xdg-open"
+                    # Detached, so the viewer outlives us and we don't wait on it
+                    subprocess.Popen(
+                        [opener, item_path],
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        start_new_session=True,
+                    )
                 return True
-        except Exception:
+        except OSError:
             return False
 
     def create_file(self, name: str) -> bool:
         """Create new file"""
         try:
-            file_path = os.path.join(self.current_path, name)
-            with open(file_path, 'x'):
-                pass
+            dir_fd = self._at(name)
+            if dir_fd is not None:
+                os.close(os.open(name, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666, dir_fd=dir_fd))
+            else:
+                file_path = os.path.join(self.current_path, name)
+                with open(file_path, 'x'):
+                    pass
+            self.invalidate()
             return True
-        except Exception:
+        except (OSError, ValueError):
             return False
 
     def create_directory(self, name: str) -> bool:
         """Create new directory"""
         try:
-            dir_path = os.path.join(self.current_path, name)
-            os.makedirs(dir_path, exist_ok=False)
+            dir_fd = self._at(name)
+            if dir_fd is not None:
+                os.mkdir(name, dir_fd=dir_fd)
+            else:
+                dir_path = os.path.join(self.current_path, name)
+                os.makedirs(dir_path, exist_ok=False)
+            self.invalidate()
             return True
-        except Exception:
+        except (OSError, ValueError):
             return False
 
     def delete_item(self, name: str) -> bool:
         """Delete file or directory"""
         try:
             item_path = os.path.join(self.current_path, name)
-            if os.path.isfile(item_path):
-                os.remove(item_path)
-            elif os.path.isdir(item_path):
+            # The type comes from the cached listing; a symlink to a
+            # directory is removed as a link. rmtree already walks with
+            # scandir and dir_fd-relative unlinks where the OS supports it.
+            if self.is_dir(name) and not os.path.islink(item_path):
                 shutil.rmtree(item_path)
+            else:
+                dir_fd = self._at(name)
+                if dir_fd is not None:
+                    os.unlink(name, dir_fd=dir_fd)
+                else:
+                    os.remove(item_path)
+            self.invalidate()
             return True
-        except Exception:
+        except OSError:
             return False
 
     def rename_item(self, old_name: str, new_name: str) -> bool:
         """Rename file or directory"""
         try:
-            old_path = os.path.join(self.current_path, old_name)
-            new_path = os.path.join(self.current_path, new_name)
-            os.rename(old_path, new_path)
+            src_fd = self._at(old_name)
+            dst_fd = self._at(new_name)
+            if src_fd is not None and dst_fd is not None:
+                os.rename(old_name, new_name, src_dir_fd=src_fd, dst_dir_fd=dst_fd)
+            else:
+                old_path = os.path.join(self.current_path, old_name)
+                new_path = os.path.join(self.current_path, new_name)
+                os.rename(old_path, new_path)
+            self.invalidate()
             return True
-        except Exception:
+        except (OSError, ValueError):
             return False
 
     def copy_item(self, name: str):
         """Copy item (store source path)"""
         self.copied_path = os.path.join(self.current_path, name)
 
-    def paste_item(self) -> bool:
-        """Paste copied item to current directory"""
+    def paste_item(self) -> Optional["Future[bool]"]:
+        """
+        Paste copied item to current directory in the background
+        
+        The copy runs on FILE_POOL so large trees don't block the UI. The
+        destination listing is not invalidated here; call invalidate() with
+        the destination once the future is done.
+        
+        Returns:
+            Future resolving to True if the copy succeeded, or None if
+            nothing was copied
+        """
         if not self.copied_path:
-            return False
+            return None
+        return FILE_POOL.submit(self._copy_item, self.copied_path, self.current_path)
+
+    @staticmethod
+    def _copy_item(src: str, dest: str) -> bool:
+        """
+        Copy a file or directory tree into dest
         
+        Args:
+            src: Source path
+            dest: Destination directory
+            
+        Returns:
+            True if successful
+        """
         try:
-            dest = self.current_path
-            if os.path.isfile(self.copied_path):
-                shutil.copy2(self.copied_path, dest)
-            elif os.path.isdir(self.copied_path):
-                new_dest = os.path.join(dest, os.path.basename(self.copied_path))
-                shutil.copytree(self.copied_path, new_dest, dirs_exist_ok=True)
+            if os.path.isfile(src):
+                _copy_file(src, os.path.join(dest, os.path.basename(src)))
+            elif os.path.isdir(src):
+                new_dest = os.path.join(dest, os.path.basename(src))
+                shutil.copytree(src, new_dest, copy_function=_copy_file, dirs_exist_ok=True)
             return True
-        except Exception:
+        except OSError:
             return False
 
-    def search_files(self, query: str) -> List[str]:
+    def search_files(self, query: str, limit: int = SEARCH_LIMIT) -> Iterator[Tuple[str, str, str, str]]:
         """
         Search files in current directory
         
+        Matches are streamed in list_directory's row format, so callers
+        don't need to stat them again. A cached listing is filtered when it
+        is still current; otherwise the directory is scanned once and only
+        matching entries are stat'ed. Stops after limit matches.
+        
         Args:
             query: Search query
+            limit: Maximum number of matches
             
-        Returns:
-            List of matching file/directory names
+        Yields:
+            (name, date_modified, file_type, size) of matching files/directories
         """
+        path = self.current_path
+        query_lower = query.lower()
         try:
-            items = os.listdir(self.current_path)
-            query_lower = query.lower()
-            matches = [name for name in items if query_lower in name.lower()]
-            return matches
-        except Exception:
-            return []
+            mtime_ns = os.stat(path).st_mtime_ns
+            cached = self._cached_listing(path, mtime_ns)
+            if cached is not None:
+                matches = (item for item in cached[2] if query_lower in item[0].lower())
+                yield from itertools.islice(matches, limit)
+                return
+            
+            with os.scandir(path) as it:
+                found = 0
+                for entry in it:
+                    if query_lower not in entry.name.lower():
+                        continue
+                    item = self._describe_entry(entry)
+                    if item is None:
+                        continue
+                    yield item
+                    found += 1
+                    if found >= limit:
+                        return
+        except OSError:
+            return
+
+    def invalidate_drives(self):
+        """Probe drives again on the next get_available_drives call"""
+        self._drives_cache = None
 
     def get_available_drives(self) -> List[str]:
-        """Get available drives (Windows)"""
-        if platform.system() == "Windows":
-            drives = [chr(x) + ":" for x in range(65, 91) if os.path.exists(chr(x) + ":")]
-            return drives
+        """Get available drives (Windows), reusing the last probe for DRIVES_CACHE_TTL seconds"""
+        if SYSTEM == "Windows":
+            now = time.monotonic()
+            if self._drives_cache is not None and now - self._drives_cache[0] < DRIVES_CACHE_TTL:
+                return list(self._drives_cache[1])
+            try:
+                # One call for the bitmask of present drives (bit 0 = A:),
+                # instead of probing each letter, which stalls on dead mounts
+                import ctypes
+                mask = ctypes.windll.kernel32.GetLogicalDrives()
+                drives = [chr(65 + i) + ":" for i in range(26) if mask & (1 << i)]
+            except (ImportError, AttributeError, OSError):
+                drives = [chr(x) + ":" for x in range(65, 91) if os.path.exists(chr(x) + ":")]
+            self._drives_cache = (now, drives)
+            return list(drives)
         else:
             return ["/"]
 
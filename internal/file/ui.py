@@ -2,17 +2,27 @@
 File manager UI components
 """
 import os
+import time
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
-from typing import List, Optional
-from internal.file.service import FileService
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
+from pkg.utils.executor import IO_POOL
+
+if TYPE_CHECKING:
+    from internal.file.service import FileService
+
+
+# How often a background directory tree scan is checked for completion (ms)
+TREE_POLL_MS = 20
+# How long the tree roots and their first level are reused across refreshes (seconds)
+TREE_ROOTS_TTL = 30.0
 
 
 class FileManagerUI:
     """File manager UI components"""
     
-    def __init__(self, parent: tk.Tk, service: FileService):
+    def __init__(self, parent: tk.Tk, service: "FileService"):
         """
         Initialize file manager UI
         
@@ -25,8 +35,27 @@ class FileManagerUI:
         self.treeview: Optional[ttk.Treeview] = None
         self.path_label: Optional[ttk.Label] = None
         self.search_entry: Optional[ttk.Entry] = None
+        # Text of the last search dispatched, see _on_search_key
+        self._search_text = ""
         self.handler = None
         self.window = None
+        # Incremental file list fill, see _fill_next
+        self._fill_chunks: Optional[Iterator[List[Tuple[str, str, str, str]]]] = None
+        self._fill_after = None
+        self._fill_count = 0
+        self._fill_size_kb = 0
+        # Background directory tree scan: generation of the latest request,
+        # and subdirectory lists prefetched for _build_directory_tree
+        self._tree_gen = 0
+        self._tree_subdirs: Dict[str, List[Tuple[str, str]]] = {}
+        # Item ids of the lazy-loading placeholder children in the tree
+        self._dummy_ids: Set[str] = set()
+        # parent item id -> {directory name: (item id, path)} for built tree levels
+        self._child_index: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        # (current path, ancestor mtimes) the tree was last built for, see _scan_tree
+        self._tree_snapshot: Optional[Tuple[str, Dict[str, Optional[int]]]] = None
+        # (time, roots, subdirectories of each root), see _scan_tree
+        self._roots_cache: Optional[Tuple[float, List[str], Dict[str, List[Tuple[str, str]]]]] = None
         
         self._create_window()
         self._create_ui()
@@ -80,6 +109,8 @@ class FileManagerUI:
         # Bind search
         self.search_entry.bind("<Button-1>", lambda e: self._clear_search_placeholder())
         self.search_entry.bind("<FocusOut>", lambda e: self._restore_search_placeholder())
+        # Search as you type; the handler debounces the searches
+        self.search_entry.bind("<KeyRelease>", lambda e: self._on_search_key())
         self.search_entry.bind("<Return>", lambda e: self._on_search())
         
         # Main content frame with paned window (row 3 after header)
@@ -184,11 +215,17 @@ class FileManagerUI:
         if self.search_entry and not self.search_entry.get():
             self.search_entry.insert(0, "Search files...")
     
+    def _on_search_key(self):
+        """Search on key release, unless the key didn't change the text (arrows, Shift...)"""
+        if self.search_entry and self.search_entry.get() != self._search_text:
+            self._on_search()
+
     def _on_search(self):
         """Handle search"""
         if not self.search_entry:
             return
         query = self.search_entry.get()
+        self._search_text = query
         if query and query != "Search files...":
             if self.handler:
                 self.handler.on_search(query)
@@ -201,30 +238,141 @@ class FileManagerUI:
         if not path:
             path = self.service.get_current_path()
         
-        try:
-            # Check if path exists and is a directory
-            if not os.path.isdir(path):
-                return
+        dirs = self._tree_subdirs.pop(path, None)
+        if dirs is None:
+            dirs = self._list_subdirs(path)
+        
+        # Call Tcl directly, skipping Treeview.insert's option formatting per row
+        tk_call = self.dir_tree.tk.call
+        tree_path = str(self.dir_tree)
+        add_dummy = self._dummy_ids.add
+        index = self._child_index[parent] = {}
+        for dir_name, dir_path in dirs:
+            item_id = tk_call(tree_path, "insert", parent, "end",
+                              "-text", dir_name, "-values", (dir_path,), "-open", False)
+            index[dir_name] = (item_id, dir_path)
+            # Always add a dummy child to make it expandable (lazy loading)
+            # This allows the tree to show the expand icon
+            add_dummy(tk_call(tree_path, "insert", item_id, "end", "-text", ""))
+
+    @staticmethod
+    def _list_subdirs(path: str) -> List[Tuple[str, str]]:
+        """
+        List subdirectories for the directory tree; safe to call off the Tk thread
+        
+        Args:
+            path: Directory path
             
-            items = os.listdir(path)
-            dirs = [item for item in items if os.path.isdir(os.path.join(path, item))]
-            dirs.sort()
+        Returns:
+            Sorted (name, path) pairs, empty if path can't be read
+        """
+        dirs = []
+        try:
+            # One scandir pass; entry types come with it, and a missing path
+            # or non-directory raises instead of needing an isdir check
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            dirs.append((entry.name, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        dirs.sort()
+        return dirs
+
+    @staticmethod
+    def _tree_mtimes(current_path: str) -> Dict[str, Optional[int]]:
+        """
+        Modification times of current_path and each of its ancestors
+        
+        Returns:
+            path -> st_mtime_ns, or None if it can't be stat'ed
+        """
+        mtimes = {}
+        path = current_path
+        while True:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        return mtimes
+
+    def _scan_tree(self, current_path: str, snapshot: Optional[Tuple[str, Dict[str, Optional[int]]]]):
+        """
+        Collect what refresh needs for the directory tree; runs on IO_POOL
+        
+        Args:
+            current_path: Directory the tree is expanded to
+            snapshot: (current_path, ancestor mtimes) the tree was last built for
             
-            for dir_name in dirs:
-                dir_path = os.path.join(path, dir_name)
-                try:
-                    # Check if we can access this directory
-                    if os.path.isdir(dir_path):
-                        item_id = self.dir_tree.insert(
-                            parent, "end", text=dir_name, values=(dir_path,), open=False
-                        )
-                        # Always add a dummy child to make it expandable (lazy loading)
-                        # This allows the tree to show the expand icon
-                        self.dir_tree.insert(item_id, "end", text="")
-                except (PermissionError, OSError):
-                    continue
-        except (PermissionError, OSError) as e:
-            pass
+        Returns:
+            None if the tree was built for this path and none of its directories
+            changed since, else (root paths, subdirectories of the roots and of
+            each ancestor of current_path, new snapshot)
+        """
+        mtimes = self._tree_mtimes(current_path)
+        if snapshot is not None and snapshot == (current_path, mtimes):
+            return None
+        
+        # Drives and the first level under them rarely change, so reuse them
+        now = time.monotonic()
+        cached = self._roots_cache
+        if cached is not None and now - cached[0] < TREE_ROOTS_TTL:
+            roots, root_subdirs = cached[1], cached[2]
+        else:
+            if os.name == 'nt':  # Windows
+                roots = [drive + "\\" for drive in self.service.get_available_drives()]
+            else:  # Unix/Linux
+                roots = ["/"]
+            root_subdirs = {root: self._list_subdirs(root) for root in roots}
+            self._roots_cache = (now, roots, root_subdirs)
+        
+        subdirs = dict(root_subdirs)
+        for path in mtimes:
+            if path not in subdirs:
+                subdirs[path] = self._list_subdirs(path)
+        return roots, subdirs, (current_path, mtimes)
+
+    def invalidate_tree(self):
+        """Rebuild the tree, rescanning its roots, on the next refresh"""
+        self._roots_cache = None
+        self._tree_snapshot = None
+
+    def _watch_tree_scan(self, future: "Future", gen: int, current_path: str):
+        """Poll a tree scan from the Tk loop and apply it if it is still the latest"""
+        if gen != self._tree_gen:
+            return
+        if not future.done():
+            self.window.after(TREE_POLL_MS, self._watch_tree_scan, future, gen, current_path)
+            return
+        result = future.result()
+        if result is None:
+            # Nothing changed; keep the tree as it is, with the user's expansions
+            return
+        roots, subdirs, self._tree_snapshot = result
+        
+        # Clear existing tree (one Tcl call for all top-level items)
+        self.dir_tree.delete(*self.dir_tree.get_children())
+        self._dummy_ids.clear()
+        self._child_index.clear()
+        self._tree_subdirs = subdirs
+        try:
+            # Add each root (drive, or /) with its first level of subdirectories
+            root_index = self._child_index[""] = {}
+            for root in roots:
+                root_id = self.dir_tree.insert("", "end", text=root, values=(root,), open=False)
+                root_index[root] = (root_id, root)
+                self._build_directory_tree(parent=root_id, path=root)
+            # Expand to current path
+            self._expand_to_path(current_path)
+        finally:
+            self._tree_subdirs = {}
     
     def _on_tree_click(self, event):
         """Handle single click on directory tree - ensure selection"""
@@ -257,20 +405,11 @@ class FileManagerUI:
                 item_id = selection[0]
         
         if item_id:
-            # Check if this item already has real children (not just dummy)
-            children = self.dir_tree.get_children(item_id)
-            has_real_children = False
-            for child in children:
-                if self.dir_tree.item(child).get("values"):
-                    has_real_children = True
-                    break
-            
             # Only build if we don't have real children yet
-            if not has_real_children:
+            children = self.dir_tree.get_children(item_id)
+            if not self._has_real_children(children):
                 # Remove dummy children
-                for child in children:
-                    if not self.dir_tree.item(child).get("values"):
-                        self.dir_tree.delete(child)
+                self._delete_dummies(children)
                 
                 # Add real children
                 item = self.dir_tree.item(item_id)
@@ -279,6 +418,18 @@ class FileManagerUI:
                     dir_path = values[0]
                     self._build_directory_tree(parent=item_id, path=dir_path)
     
+    def _has_real_children(self, children) -> bool:
+        """Whether a node's children are real directories, not the lazy-loading placeholder"""
+        # Placeholders are only ever inserted as the sole child
+        return bool(children) and children[0] not in self._dummy_ids
+
+    def _delete_dummies(self, children):
+        """Delete the lazy-loading placeholders among children in one call"""
+        dummies = [child for child in children if child in self._dummy_ids]
+        if dummies:
+            self.dir_tree.delete(*dummies)
+            self._dummy_ids.difference_update(dummies)
+    
     def _expand_to_path(self, target_path):
         """Expand tree to show target path"""
         if not self.dir_tree:
@@ -295,85 +446,46 @@ class FileManagerUI:
             if parts[0] == '':
                 parts[0] = '/'
         
-        # Find and expand path
-        current_items = self.dir_tree.get_children()
-        current_path = ""
+        # Find and expand path, looking each part up in its parent's child index
+        parent_id = ""
         
         for part in parts:
             if not part:
                 continue
             
-            found = False
-            for item_id in current_items:
-                item = self.dir_tree.item(item_id)
-                if item.get("text") == part:
-                    # Expand this item
-                    self.dir_tree.item(item_id, open=True)
-                    # Check if children need to be built
-                    children = self.dir_tree.get_children(item_id)
-                    has_real_children = any(self.dir_tree.item(child).get("values") for child in children)
-                    
-                    if not has_real_children:
-                        # Remove dummy children
-                        for child in children:
-                            if not self.dir_tree.item(child).get("values"):
-                                self.dir_tree.delete(child)
-                        # Build real children
-                        values = item.get("values", [])
-                        if values and values[0]:
-                            dir_path = values[0]
-                            self._build_directory_tree(parent=item_id, path=dir_path)
-                    
-                    current_items = self.dir_tree.get_children(item_id)
-                    found = True
-                    break
-            
-            if not found:
+            child = self._child_index.get(parent_id, {}).get(part)
+            if child is None:
                 break
+            item_id, dir_path = child
+            
+            # Expand this item
+            self.dir_tree.item(item_id, open=True)
+            # Check if children need to be built
+            children = self.dir_tree.get_children(item_id)
+            if not self._has_real_children(children):
+                # Remove dummy children
+                self._delete_dummies(children)
+                # Build real children
+                self._build_directory_tree(parent=item_id, path=dir_path)
+            
+            parent_id = item_id
     
-    def refresh(self, filtered_items: Optional[List[str]] = None):
+    def refresh(self, filtered_items: Optional[List[Tuple[str, str, str, str]]] = None):
         """Refresh directory tree and file list"""
-        # Refresh directory tree
+        # Refresh directory tree; drives and directories are scanned in the
+        # background so a slow mount doesn't block the window
         if self.dir_tree:
-            # Clear existing tree
-            for item in self.dir_tree.get_children():
-                self.dir_tree.delete(item)
-            
-            # Build tree from root
+            self._tree_gen += 1
             current_path = self.service.get_current_path()
-            
-            if os.name == 'nt':  # Windows
-                # Get all drives
-                import string
-                drives = []
-                for letter in string.ascii_uppercase:
-                    drive = f"{letter}:\\"
-                    if os.path.exists(drive):
-                        drives.append(drive)
-                
-                # Add each drive as root node
-                for drive in drives:
-                    drive_id = self.dir_tree.insert("", "end", text=drive, values=(drive,), open=False)
-                    # Build immediate subdirectories for this drive (first level only)
-                    self._build_directory_tree(parent=drive_id, path=drive)
-                
-                # Expand to current path
-                self._expand_to_path(current_path)
-            else:  # Unix/Linux
-                # Add root node
-                root_id = self.dir_tree.insert("", "end", text="/", values=("/",), open=False)
-                # Build immediate subdirectories (first level only)
-                self._build_directory_tree(parent=root_id, path="/")
-                # Expand to current path
-                self._expand_to_path(current_path)
+            future = IO_POOL.submit(self._scan_tree, current_path, self._tree_snapshot)
+            self._watch_tree_scan(future, self._tree_gen, current_path)
         
         # Refresh file list
         if not self.treeview:
             return
 
-        # Clear existing items
-        for item in self.treeview.get_children():
-            self.treeview.delete(item)
+        # Clear existing items (one Tcl call for all rows)
+        self.treeview.delete(*self.treeview.get_children())
 
         # Update path label
         if self.path_label:
@@ -381,53 +493,58 @@ class FileManagerUI:
             display_path = path.replace('\\', ' > ')
             self.path_label.config(text=display_path)
 
-        # Get directory items
+        # Bind double-click
+        if self.treeview and self.handler:
+            self.treeview.bind("<Double-1>", lambda e: self.handler.on_double_click(e))
+
+        # Insert items chunk by chunk, so a large directory fills in while
+        # the window stays responsive (search results already come as rows)
+        self._cancel_fill()
         if filtered_items:
-            items = []
-            for name in filtered_items:
-                item_path = os.path.join(self.service.get_current_path(), name)
-                try:
-                    date_modified = os.path.getmtime(item_path)
-                    date_str = datetime.fromtimestamp(date_modified).strftime("%d-%m-%Y %I:%M")
-                    
-                    if os.path.isdir(item_path):
-                        file_type = "Directory"
-                        size = ""
-                        icon = "📁"
-                    else:
-                        ext = os.path.splitext(name)[1]
-                        file_type = ext.upper()[1:] + " file" if ext else "Unknown file"
-                        size_kb = round(os.stat(item_path).st_size / 1024)
-                        size = f"{size_kb} KB"
-                        icon = "📄"
-                    
-                    items.append((name, date_str, file_type, size, icon))
-                except Exception:
-                    continue
+            self._fill_chunks = iter([filtered_items])
         else:
-            items_data = self.service.list_directory()
-            items = []
-            for name, date_str, file_type, size in items_data:
-                icon = "📁" if file_type == "Directory" else "📄"
-                items.append((name, date_str, file_type, size, icon))
+            self._fill_chunks = self.service.list_directory_chunks()
+        self._fill_count = 0
+        self._fill_size_kb = 0
+        self._fill_next()
 
-        # Insert items
-        total_size = 0
-        for name, date_str, file_type, size, icon in items:
-            self.treeview.insert("", "end", values=(name, date_str, file_type, size))
-            if size:
-                try:
-                    total_size += int(size.split()[0])
-                except:
-                    pass
+    def _fill_next(self):
+        """Insert the next chunk of the file list and schedule the one after"""
+        self._fill_after = None
+        chunk = next(self._fill_chunks, None) if self._fill_chunks else None
+        if chunk is None:
+            self._fill_chunks = None
+        else:
+            # Call Tcl directly, skipping Treeview.insert's option formatting per row
+            tk_call = self.treeview.tk.call
+            tree_path = str(self.treeview)
+            total_kb = 0
+            for row in chunk:
+                tk_call(tree_path, "insert", "", "end", "-values", row)
+                size = row[3]
+                if size:
+                    try:
+                        total_kb += int(size.split()[0])
+                    except:
+                        pass
+            self._fill_size_kb += total_kb
+            self._fill_count += len(chunk)
+            self._fill_after = self.window.after(1, self._fill_next)
 
         # Update footer
         if self.footer_label:
-            self.footer_label.config(text=f"{len(items)} items | {round(total_size / 1024, 1)} MB Total")
-        
-        # Bind double-click
-        if self.treeview and self.handler:
-            self.treeview.bind("<Double-1>", lambda e: self.handler.on_double_click(e))
+            self.footer_label.config(text=f"{self._fill_count} items | {round(self._fill_size_kb / 1024, 1)} MB Total")
+
+    def _cancel_fill(self):
+        """Stop filling the file list from a previous refresh"""
+        if self._fill_after is not None:
+            self.window.after_cancel(self._fill_after)
+            self._fill_after = None
+        if self._fill_chunks is not None:
+            close = getattr(self._fill_chunks, "close", None)
+            if close:
+                close()
+            self._fill_chunks = None
 
     def get_selected_item(self) -> Optional[str]:
         """Get selected item name"""
@@ -1,4 +1,9 @@
 """
 Data models
 """
+import sys
 
+
+# Extra dataclass() options: slots=True needs Python 3.10, older versions keep
+# __dict__-backed instances
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
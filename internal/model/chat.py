@@ -1,11 +1,12 @@
 """
 Chat data models
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
+from internal.model import DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ChatMessage:
     """Chat message model"""
     role: str  # 'user' or 'assistant'
@@ -20,20 +21,32 @@ class ChatMessage:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ChatHistory:
     """Chat history model"""
     messages: List[ChatMessage]
+    # API format of messages, kept in step by add_message/clear
+    _api_cache: List[dict] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._api_cache = [msg.to_dict() for msg in self.messages]
 
     def to_api_format(self) -> List[dict]:
-        """Convert to API format"""
-        return [msg.to_dict() for msg in self.messages]
+        """
+        Convert to API format
+        
+        Returns the maintained list rather than rebuilding it, so callers
+        must not modify it.
+        """
+        return self._api_cache
 
     def add_message(self, message: ChatMessage):
         """Add message to history"""
         self.messages.append(message)
+        self._api_cache.append(message.to_dict())
 
     def clear(self):
         """Clear all messages"""
         self.messages.clear()
+        self._api_cache.clear()
 
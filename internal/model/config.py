@@ -2,9 +2,10 @@
 Configuration models
 """
 from dataclasses import dataclass
+from internal.model import DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AppConfig:
     """Application configuration"""
     api_url: str = "http://127.0.0.1:11434"
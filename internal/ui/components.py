@@ -5,6 +5,13 @@ import tkinter as tk
 from tkinter import ttk
 
 
+# Tick of the indeterminate progress bar; slow enough not to keep waking the
+# event loop while a response streams
+PROGRESS_INTERVAL_MS = 50
+# Steps in one sweep of the bar (one per tick), about 2.5 s per sweep
+PROGRESS_STEPS = 50
+
+
 class HeaderFrame:
     """Header frame with model selection and controls"""
     
@@ -151,6 +158,7 @@ class ProgressFrame:
         self.progress = ttk.Progressbar(
             self.frame,
             mode="indeterminate",
+            maximum=PROGRESS_STEPS,
         )
 
         # Stop button
@@ -164,7 +172,7 @@ class ProgressFrame:
         """Show progress bar"""
         self.progress.grid(row=0, column=0, sticky="nsew")
         self.stop_button.grid(row=0, column=1, padx=20)
-        self.progress.start(5)
+        self.progress.start(PROGRESS_INTERVAL_MS)
 
     def hide(self):
         """Hide progress bar"""
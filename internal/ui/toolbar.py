@@ -5,46 +5,115 @@ import tkinter as tk
 from tkinter import ttk
 
 
-def create_tooltip(widget, text):
-    """Create a tooltip for a widget"""
-    def on_enter(event):
-        tooltip = tk.Toplevel()
-        tooltip.wm_overrideredirect(True)
-        tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
-        label = tk.Label(
-            tooltip,
-            text=text,
+# How long the pointer must rest on a widget before its tooltip shows
+TOOLTIP_DELAY_MS = 500
+
+# ttk style shared by the toolbar's icon buttons
+BUTTON_STYLE = "Toolbar.TButton"
+
+# Toolbar buttons as (name, icon, tooltip), left to right; None is a separator
+TOOLBAR_BUTTONS = (
+    ('file', "📁", "File Manager"),
+    ('new', "✨", "New Chat"),
+    None,
+    ('settings', "⚙️", "Settings"),
+    ('models', "📦", "Model Management"),
+    None,
+    ('audio', "🎵", "Audio Processor"),
+    ('refresh', "🔄", "Refresh Models"),
+)
+
+
+class _Tooltip:
+    """Tooltip window shared by all widgets, hidden and shown instead of recreated"""
+    
+    def __init__(self):
+        self._tip = None
+        self._label = None
+        # (widget, after id) of a pending show, see schedule
+        self._pending = None
+
+    def _ensure(self, widget):
+        """Create the window on first use, or again if its parent was destroyed"""
+        if self._tip is not None and self._tip.winfo_exists():
+            return
+        self._tip = tk.Toplevel(widget.winfo_toplevel())
+        self._tip.wm_overrideredirect(True)
+        self._tip.withdraw()
+        self._label = tk.Label(
+            self._tip,
             background="#ffffe0",
             relief=tk.SOLID,
             borderwidth=1,
             font=("TkDefaultFont", 9)
         )
-        label.pack()
-        widget.tooltip = tooltip
-    
-    def on_leave(event):
-        if hasattr(widget, 'tooltip'):
-            widget.tooltip.destroy()
-            del widget.tooltip
-    
-    widget.bind('<Enter>', on_enter)
-    widget.bind('<Leave>', on_leave)
+        self._label.pack()
+
+    def schedule(self, widget, text: str, x: int, y: int):
+        """Show text at (x, y) after TOOLTIP_DELAY_MS, unless hidden first"""
+        self._cancel()
+        self._pending = (widget, widget.after(TOOLTIP_DELAY_MS, self.show, widget, text, x, y))
+
+    def _cancel(self):
+        """Cancel a pending show"""
+        if self._pending is not None:
+            widget, after_id = self._pending
+            self._pending = None
+            try:
+                widget.after_cancel(after_id)
+            except tk.TclError:
+                pass
+
+    def show(self, widget, text: str, x: int, y: int):
+        """Show text at screen position (x, y)"""
+        self._pending = None
+        self._ensure(widget)
+        self._label.config(text=text)
+        self._tip.wm_geometry(f"+{x}+{y}")
+        self._tip.deiconify()
+        self._tip.lift()
+
+    def hide(self):
+        """Hide the tooltip"""
+        self._cancel()
+        if self._tip is not None and self._tip.winfo_exists():
+            self._tip.withdraw()
+
+
+_tooltip = _Tooltip()
+
+
+def create_tooltip(widget, text):
+    """Create a tooltip for a widget"""
+    # Passing over a widget doesn't show anything; only resting on it does
+    widget.bind('<Enter>', lambda e: _tooltip.schedule(widget, text, e.x_root + 10, e.y_root + 10))
+    widget.bind('<Leave>', lambda e: _tooltip.hide())
+    # A widget destroyed while hovered gets no <Leave>; don't leave its tip up
+    # or its pending show holding on to it
+    widget.bind('<Destroy>', lambda e: _tooltip.hide(), add='+')
 
 
 class Toolbar:
     """Toolbar with common action buttons"""
     
-    def __init__(self, parent: tk.Tk):
+    __slots__ = ('parent', 'spec', 'frame', 'buttons')
+    
+    def __init__(self, parent: tk.Tk, spec: tuple = TOOLBAR_BUTTONS):
         """
         Initialize toolbar
         
         Args:
             parent: Parent window
+            spec: Buttons as (name, icon, tooltip), left to right; None is a separator
         """
         self.parent = parent
+        self.spec = spec
         self.frame = ttk.Frame(parent, relief=tk.FLAT, borderwidth=1)
         self.buttons = {}
         
+        # Icon button style - clean and minimal, set once for every button
+        ttk.Style(parent).configure(BUTTON_STYLE, width=3, padding=(4, 2))
+        
         self._create_toolbar()
 
     def _create_toolbar(self):
@@ -52,78 +121,24 @@ class Toolbar:
         self.frame.grid(row=1, column=0, sticky="ew", padx=0, pady=0)
         self.frame.grid_columnconfigure(0, weight=0)
         
-        # Icon button style - clean and minimal
-        icon_style = {
-            'width': 3,
-            'padding': (4, 2)
-        }
-        
-        # File Manager button (📁) - First button
-        self.buttons['file'] = ttk.Button(
-            self.frame,
-            text="📁",
-            **icon_style
-        )
-        self.buttons['file'].grid(row=0, column=0, padx=1, pady=2, sticky="w")
-        create_tooltip(self.buttons['file'], "File Manager")
-        
-        # New Chat button (📝 or ✨) - Second button
-        self.buttons['new'] = ttk.Button(
-            self.frame,
-            text="✨",
-            **icon_style
-        )
-        self.buttons['new'].grid(row=0, column=1, padx=1, pady=2, sticky="w")
-        create_tooltip(self.buttons['new'], "New Chat")
-        
-        # Separator
-        separator1 = ttk.Separator(self.frame, orient=tk.VERTICAL)
-        separator1.grid(row=0, column=2, padx=3, pady=2, sticky="ns")
-        
-        # Settings button (⚙️)
-        self.buttons['settings'] = ttk.Button(
-            self.frame,
-            text="⚙️",
-            **icon_style
-        )
-        self.buttons['settings'].grid(row=0, column=3, padx=1, pady=2, sticky="w")
-        create_tooltip(self.buttons['settings'], "Settings")
-        
-        # Model Management button (📦 or 🤖)
-        self.buttons['models'] = ttk.Button(
-            self.frame,
-            text="📦",
-            **icon_style
-        )
-        self.buttons['models'].grid(row=0, column=4, padx=1, pady=2, sticky="w")
-        create_tooltip(self.buttons['models'], "Model Management")
-        
-        # Separator
-        separator2 = ttk.Separator(self.frame, orient=tk.VERTICAL)
-        separator2.grid(row=0, column=5, padx=3, pady=2, sticky="ns")
-        
-        # Audio Processor button (🎵)
-        self.buttons['audio'] = ttk.Button(
-            self.frame,
-            text="🎵",
-            **icon_style
-        )
-        self.buttons['audio'].grid(row=0, column=6, padx=1, pady=2, sticky="w")
-        create_tooltip(self.buttons['audio'], "Audio Processor")
-        
-        # Refresh button (🔄)
-        self.buttons['refresh'] = ttk.Button(
-            self.frame,
-            text="🔄",
-            **icon_style
-        )
-        self.buttons['refresh'].grid(row=0, column=7, padx=1, pady=2, sticky="w")
-        create_tooltip(self.buttons['refresh'], "Refresh Models")
+        # One button per entry, in column order; None entries are separators
+        for column, spec in enumerate(self.spec):
+            if spec is None:
+                ttk.Separator(self.frame, orient=tk.VERTICAL).grid(
+                    row=0, column=column, padx=3, pady=2, sticky="ns"
+                )
+                continue
+            name, icon, tooltip = spec
+            button = ttk.Button(self.frame, text=icon, style=BUTTON_STYLE)
+            button.grid(row=0, column=column, padx=1, pady=2, sticky="w")
+            create_tooltip(button, tooltip)
+            self.buttons[name] = button
         
         # Spacer to push buttons to left
+        column = len(self.spec)
         spacer = ttk.Frame(self.frame)
-        spacer.grid(row=0, column=8, sticky="ew")
-        self.frame.grid_columnconfigure(8, weight=1)
+        spacer.grid(row=0, column=column, sticky="ew")
+        self.frame.grid_columnconfigure(column, weight=1)
 
     def set_command(self, button_name: str, command):
         """
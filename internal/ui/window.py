@@ -4,17 +4,27 @@ Main window and application setup
 import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Optional
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Optional
 import webbrowser
-from pkg.api.ollama import OllamaClient
-from pkg.utils.system import check_system_compatibility
+from pkg.utils.executor import IO_POOL
+from pkg.utils.system import compatibility_warning
 from internal.model.config import AppConfig
 from internal.file.service import FileService
 from internal.file.ui import FileManagerUI
 from internal.file.handler import FileHandler
-from internal.chat.window import ChatWindow
 from internal.ui.toolbar import Toolbar
-from threading import Thread
+
+# The chat side (HTTP client, chat window) is imported when first opened, so
+# starting the file manager doesn't load it
+if TYPE_CHECKING:
+    from pkg.api.ollama import OllamaClient
+    from internal.chat.window import ChatWindow
+    from internal.chat.model_manager import ModelManager
+
+
+# How often the background system check is checked for completion (ms)
+SYSTEM_CHECK_POLL_MS = 50
 
 
 class App:
@@ -24,11 +34,16 @@ class App:
         """Initialize application"""
         self.config = AppConfig()
         self.root: Optional[tk.Tk] = None
-        self.api_client: Optional[OllamaClient] = None
+        self.api_client: Optional["OllamaClient"] = None
         self.file_service: Optional[FileService] = None
         self.file_ui: Optional[FileManagerUI] = None
         self.file_handler: Optional[FileHandler] = None
-        self.chat_window: Optional[ChatWindow] = None
+        self.chat_window: Optional["ChatWindow"] = None
+        self.model_manager: Optional["ModelManager"] = None
+        self._about_window: Optional[tk.Toplevel] = None
+        # Screen size, read once when the main window is created
+        self._screen_w = 0
+        self._screen_h = 0
         self.menubar: Optional[tk.Menu] = None
         self.toolbar: Optional[Toolbar] = None
 
@@ -50,9 +65,9 @@ class App:
         self.root.title("Assistant - File Manager")
         
         # Set window size and position
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-        self.root.geometry(f"900x600+{(screen_width - 900) // 2}+{(screen_height - 600) // 2}")
+        self._screen_w = self.root.winfo_screenwidth()
+        self._screen_h = self.root.winfo_screenheight()
+        self.root.geometry(self._center_geometry(900, 600))
         
         # Configure grid
         # Row 0: Menu bar (handled by tkinter)
@@ -62,11 +77,21 @@ class App:
         self.root.grid_columnconfigure(0, weight=1)
         self.root.grid_rowconfigure(3, weight=1)  # File manager list expands
 
+    def _center_geometry(self, width: int, height: int) -> str:
+        """
+        Geometry string for a window centered on the screen
+        
+        Args:
+            width: Window width
+            height: Window height
+            
+        Returns:
+            Tk geometry string
+        """
+        return f"{width}x{height}+{(self._screen_w - width) // 2}+{(self._screen_h - height) // 2}"
+
     def _setup_components(self):
         """Setup application components"""
-        # API client (for chat)
-        self.api_client = OllamaClient(self.config.api_url)
-        
         # File service
         self.file_service = FileService()
         
@@ -109,13 +134,21 @@ class App:
         # Refresh button - refresh file manager
         self.toolbar.set_command('refresh', self._refresh_file_manager)
     
-    def _show_chat(self):
-        """Show chat window"""
+    def _get_api_client(self) -> "OllamaClient":
+        """Get the API client (for chat), creating it on first use"""
         if not self.api_client:
+            from pkg.api.ollama import OllamaClient
             self.api_client = OllamaClient(self.config.api_url)
-        
-        # Create or show chat window
-        self.chat_window = ChatWindow(self.root, self.api_client)
+        return self.api_client
+
+    def _show_chat(self):
+        """Show chat window"""
+        # Create chat window once, then show it again
+        if self.chat_window is None or not self.chat_window.window.winfo_exists():
+            from internal.chat.window import ChatWindow
+            self.chat_window = ChatWindow(self.root, self._get_api_client())
+        else:
+            self.chat_window.show()
     
     def _refresh_file_manager(self):
         """Refresh file manager"""
@@ -154,27 +187,43 @@ class App:
 
     def _show_model_management(self):
         """Show model management window"""
-        if not self.api_client:
-            self.api_client = OllamaClient(self.config.api_url)
-        
-        from internal.chat.model_manager import ModelManager
-        model_manager = ModelManager(self.root, self.api_client)
-        model_manager.show_window()
+        # Built once; show_window raises the open window or rebuilds a closed one
+        if self.model_manager is None:
+            from internal.chat.model_manager import ModelManager
+            self.model_manager = ModelManager(self.root, self._get_api_client())
+        self.model_manager.show_window()
 
     def _show_help(self):
         """Show help dialog with GitHub link"""
+        # Built on first use, then hidden and shown again
+        if self._about_window is None or not self._about_window.winfo_exists():
+            self._about_window = self._build_about()
+        self._about_window.deiconify()
+        self._about_window.lift()
+        self._about_window.grab_set()
+
+    def _hide_help(self):
+        """Hide help dialog, keeping it for the next open"""
+        if self._about_window:
+            self._about_window.grab_release()
+            self._about_window.withdraw()
+
+    def _build_about(self) -> tk.Toplevel:
+        """
+        Build the help dialog
+        
+        Returns:
+            Hidden about window
+        """
         # Create a custom dialog window
         about_window = tk.Toplevel(self.root)
+        about_window.withdraw()
         about_window.title("About")
         about_window.transient(self.root)
-        about_window.grab_set()
+        about_window.protocol("WM_DELETE_WINDOW", self._hide_help)
         
         # Center the window
-        screen_width = about_window.winfo_screenwidth()
-        screen_height = about_window.winfo_screenheight()
-        x = (screen_width - 400) // 2
-        y = (screen_height - 300) // 2
-        about_window.geometry(f"400x300+{x}+{y}")
+        about_window.geometry(self._center_geometry(400, 300))
         
         # Content frame
         content_frame = ttk.Frame(about_window, padding=20)
@@ -234,16 +283,30 @@ class App:
         close_button = ttk.Button(
             content_frame,
             text="Close",
-            command=about_window.destroy
+            command=self._hide_help
         )
         close_button.pack()
+        
+        return about_window
 
     def _check_system(self):
-        """Check system compatibility"""
+        """Check system compatibility in the background"""
         if self.root:
-            message = check_system_compatibility(self.root)
-            if message:
-                messagebox.showwarning("Warning", message, parent=self.root)
+            # The Tcl query needs the Tk thread; the OS probing does not
+            tcl_version = self.root.tk.call("info", "patchlevel")
+            self._watch_system_check(IO_POOL.submit(compatibility_warning, tcl_version))
+
+    def _watch_system_check(self, future: Future):
+        """Poll the system check from the Tk loop and show its warning, if any"""
+        if not future.done():
+            self.root.after(SYSTEM_CHECK_POLL_MS, self._watch_system_check, future)
+            return
+        try:
+            message = future.result()
+        except Exception:
+            return
+        if message:
+            messagebox.showwarning("Warning", message, parent=self.root)
 
     def run(self):
         """Run application"""
@@ -2,6 +2,7 @@
 Assistant - Multi-functional assistant application
 Main entry point
 """
+import multiprocessing
 import sys
 import os
 
@@ -18,5 +19,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Audio processing uses a process pool; required for frozen builds
+    multiprocessing.freeze_support()
     main()
 
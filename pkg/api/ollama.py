@@ -1,23 +1,308 @@
 """
 Ollama API client
 """
+import base64
+import functools
+import http.client
 import json
+import socket
 import urllib.parse
 import urllib.request
-from typing import List, Generator, Optional
+from contextlib import contextmanager
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Iterator, List, Generator, Optional, Tuple
+
+# JSON backend: orjson (C, reads and writes bytes directly) when installed, else json
+_loads: Callable[[bytes], Any]
+_dumps: Callable[[Any], bytes]
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    # json.loads takes UTF-8 bytes as they are
+    _loads = json.loads
+    _dumps = lambda obj: json.dumps(obj).encode("utf-8")
+
+
+# Idle keep-alive connections kept per host
+POOL_SIZE = 4
+
+# Most bytes taken from a streamed response per read
+READ_SIZE = 65536
+
+# Seconds to wait for a connection to the host
+CONNECT_TIMEOUT = 5.0
+
+# Seconds to wait for each read of a response; loading a large model can take
+# minutes before the first chat token arrives
+READ_TIMEOUT = 300.0
+
+# Headers sent with every JSON request body
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# JSON bodies of the streaming requests; only the %s parts vary, each
+# filled with an encoded value
+CHAT_BODY = b'{"model":%s,"messages":%s,"stream":true}'
+PULL_BODY = b'{"name":%s,"insecure":%s,"stream":true}'
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections by (scheme, host:port, proxy), shared by all clients and threads"""
+    
+    def __init__(self):
+        self._idle: Dict[Tuple[str, str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = Lock()
+
+    def acquire(self, key: Tuple[str, str, str]) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Take an idle connection to a host, or open a new one
+        
+        Args:
+            key: (scheme, host:port, proxy URL or "")
+            
+        Returns:
+            (connection, whether it was reused)
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self.connect(key), False
+
+    @staticmethod
+    def connect(key: Tuple[str, str, str]) -> http.client.HTTPConnection:
+        """
+        Open a new connection to a host
+        
+        Through a proxy, an https host is reached with a CONNECT tunnel; an
+        http host is served by the proxy itself (see _request).
+        """
+        scheme, netloc, proxy = key
+        if not proxy:
+            if scheme == "https":
+                return http.client.HTTPSConnection(netloc)
+            return http.client.HTTPConnection(netloc)
+        proxy_netloc, proxy_headers = _parse_proxy(proxy)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_netloc)
+            conn.set_tunnel(netloc, headers=proxy_headers)
+            return conn
+        return http.client.HTTPConnection(proxy_netloc)
+
+    def release(self, key: Tuple[str, str, str], conn: http.client.HTTPConnection):
+        """Return a connection whose response was fully read; closed if the pool is full"""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < POOL_SIZE:
+                idle.append(conn)
+                return
+        conn.close()
+
+
+_pool = _ConnectionPool()
+
+
+class CancelEvent(Event):
+    """
+    Event that also aborts the request it is attached to when set
+    
+    Setting it shuts down the request's socket, so a read blocked on a quiet
+    host returns right away instead of waiting for the next record or the
+    read timeout.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._sock: Optional[socket.socket] = None
+        self._sock_lock = Lock()
+
+    def set(self):
+        """Set the event and abort the attached request, if any"""
+        super().set()
+        with self._sock_lock:
+            sock = self._sock
+        if sock is not None:
+            _shutdown(sock)
+
+    def attach(self, sock: socket.socket):
+        """Abort this socket on set(); aborted right away if already set"""
+        with self._sock_lock:
+            self._sock = sock
+        if self.is_set():
+            _shutdown(sock)
+
+    def detach(self):
+        """Stop aborting the attached socket"""
+        with self._sock_lock:
+            self._sock = None
+
+
+def _shutdown(sock: socket.socket):
+    """Shut a socket down from any thread, waking a blocked read"""
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=16)
+def _host_key(api_url: str) -> Tuple[str, str, str]:
+    """
+    (scheme, host:port, proxy URL) of an API URL, resolved once per URL
+    
+    The proxy is the one urllib.request would use: from the *_proxy
+    environment variables (or the system settings), "" when there is none or
+    no_proxy bypasses the host.
+    """
+    url = urllib.parse.urlsplit(api_url)
+    proxy = urllib.request.getproxies().get(url.scheme, "")
+    if proxy and urllib.request.proxy_bypass(url.netloc):
+        proxy = ""
+    return url.scheme, url.netloc, proxy
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_proxy(proxy: str) -> Tuple[str, Dict[str, str]]:
+    """
+    host:port of a proxy URL and the headers that authenticate with it
+    
+    Returns:
+        (host:port, {"Proxy-Authorization": ...} if the URL has credentials, else {})
+    """
+    if "//" not in proxy:
+        # Scheme-less proxies ("host:3128") are accepted, as by urllib
+        proxy = "http://" + proxy
+    url = urllib.parse.urlsplit(proxy)
+    netloc = url.netloc.rpartition("@")[2]
+    if url.username is None:
+        return netloc, {}
+    credentials = "%s:%s" % (urllib.parse.unquote(url.username), urllib.parse.unquote(url.password or ""))
+    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return netloc, {"Proxy-Authorization": "Basic " + token}
+
+
+def _iter_ndjson(response: http.client.HTTPResponse) -> Iterator[Any]:
+    """
+    Decode a newline-delimited JSON response as it arrives
+    
+    Reads whatever has been received (up to READ_SIZE) at a time and decodes
+    every complete line in it, instead of one readline per record.
+    
+    Args:
+        response: Streamed response
+        
+    Yields:
+        Decoded records
+    """
+    buf = bytearray()
+    while True:
+        data = response.read1(READ_SIZE)
+        if not data:
+            break
+        buf += data
+        end = buf.rfind(b"\n")
+        if end < 0:
+            continue
+        lines = buf[:end].split(b"\n")
+        del buf[:end + 1]
+        for line in lines:
+            if line.strip():
+                yield _loads(line)
+    if buf.strip():
+        yield _loads(buf)
 
 
 class OllamaClient:
     """Ollama API client"""
     
-    def __init__(self, api_url: str = "http://127.0.0.1:11434"):
+    def __init__(self, api_url: str = "http://127.0.0.1:11434",
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT):
         """
         Initialize Ollama client
         
         Args:
             api_url: Ollama API base URL
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for each read of a response
         """
         self.api_url = api_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+    def _send(self, conn: http.client.HTTPConnection, method: str, path: str,
+              body: Optional[bytes], headers: Dict[str, str],
+              cancel: Optional[Event]) -> http.client.HTTPResponse:
+        """Send a request and wait for the response headers, within this client's timeouts"""
+        # Pooled connections are shared between clients, so set timeouts per request
+        conn.timeout = self.connect_timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(self.connect_timeout)
+        conn.request(method, path, body=body, headers=headers)
+        conn.sock.settimeout(self.read_timeout)
+        if isinstance(cancel, CancelEvent):
+            cancel.attach(conn.sock)
+        return conn.getresponse()
+
+    @contextmanager
+    def _request(self, method: str, path: str, body: Optional[bytes] = None,
+                 cancel: Optional[Event] = None) -> Iterator[http.client.HTTPResponse]:
+        """
+        Send a request over a pooled keep-alive connection
+        
+        The connection goes back to the pool if the response was read to the
+        end, and is closed otherwise (e.g. a stream left early). Proxies are
+        used as configured for urllib; redirects are not followed, a 3xx
+        status fails like an error status.
+        
+        Args:
+            method: HTTP method
+            path: Path on the API host
+            body: Encoded JSON request body
+            cancel: A CancelEvent set during the request aborts it
+            
+        Yields:
+            Response
+            
+        Raises:
+            OSError, http.client.HTTPException: Connection failure, timeout or error status
+        """
+        key = _host_key(self.api_url)
+        headers = JSON_HEADERS if body is not None else {}
+        scheme, netloc, proxy = key
+        if proxy and scheme == "http":
+            # A forwarding proxy takes the absolute URL
+            path = "http://" + netloc + path
+            proxy_headers = _parse_proxy(proxy)[1]
+            if proxy_headers:
+                headers = {**headers, **proxy_headers}
+
+        conn, reused = _pool.acquire(key)
+        try:
+            try:
+                response = self._send(conn, method, path, body, headers, cancel)
+            except (ConnectionError, http.client.BadStatusLine):
+                # The host may have dropped an idle connection; retry once on a new one
+                conn.close()
+                if not reused or (cancel is not None and cancel.is_set()):
+                    raise
+                conn = _pool.connect(key)
+                response = self._send(conn, method, path, body, headers, cancel)
+            if response.status >= 300:
+                raise http.client.HTTPException(f"HTTP Error {response.status}: {response.reason}")
+            yield response
+        except BaseException:
+            conn.close()
+            raise
+        finally:
+            if isinstance(cancel, CancelEvent):
+                cancel.detach()
+        # An aborted socket is shut down even if the response happened to end
+        if (response.isclosed() and not response.will_close
+                and not (cancel is not None and cancel.is_set())):
+            _pool.release(key, conn)
+        else:
+            conn.close()
 
     def fetch_models(self) -> List[str]:
         """
@@ -27,44 +312,41 @@ class OllamaClient:
             List of model names
         """
         try:
-            with urllib.request.urlopen(
-                urllib.parse.urljoin(self.api_url, "/api/tags")
-            ) as response:
-                data = json.load(response)
+            with self._request("GET", "/api/tags") as response:
+                data = _loads(response.read())
                 models = [model["name"] for model in data["models"]]
                 return models
         except Exception:
             return []
 
-    def chat_stream(self, model: str, messages: List[dict]) -> Generator[str, None, None]:
+    def chat_stream(self, model: str, messages: List[dict],
+                    cancel: Optional[Event] = None) -> Generator[str, None, None]:
         """
         Stream chat response
         
         Args:
             model: Model name
             messages: Chat messages in API format
+            cancel: When set, the stream ends; a CancelEvent also aborts a read
+                waiting on the host
             
         Yields:
             Response content chunks
         """
-        request = urllib.request.Request(
-            urllib.parse.urljoin(self.api_url, "/api/chat"),
-            data=json.dumps({
-                "model": model,
-                "messages": messages,
-                "stream": True,
-            }).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
+        body = CHAT_BODY % (_dumps(model), _dumps(messages))
 
         try:
-            with urllib.request.urlopen(request) as resp:
-                for line in resp:
-                    data = json.loads(line.decode("utf-8"))
+            with self._request("POST", "/api/chat", body, cancel) as resp:
+                for data in _iter_ndjson(resp):
+                    # Leaving the with block before the end closes the connection
+                    if cancel is not None and cancel.is_set():
+                        break
                     if "message" in data:
                         yield data["message"]["content"]
         except Exception as e:
+            # An aborted read fails; that is the requested stop, not an error
+            if cancel is not None and cancel.is_set():
+                return
             raise Exception(f"API request failed: {e}")
 
     def delete_model(self, model_name: str) -> bool:
@@ -77,13 +359,9 @@ class OllamaClient:
         Returns:
             True if successful
         """
-        req = urllib.request.Request(
-            urllib.parse.urljoin(self.api_url, "/api/delete"),
-            data=json.dumps({"name": model_name}).encode("utf-8"),
-            method="DELETE",
-        )
         try:
-            with urllib.request.urlopen(req) as response:
+            with self._request("DELETE", "/api/delete", _dumps({"name": model_name})) as response:
+                response.read()
                 return response.status == 200
         except Exception:
             return False
@@ -97,27 +375,24 @@ class OllamaClient:
             insecure: Allow insecure connections
             
         Yields:
-            Status messages
-        """
-        req = urllib.request.Request(
-            urllib.parse.urljoin(self.api_url, "/api/pull"),
-            data=json.dumps({
-                "name": model_name,
-                "insecure": insecure,
-                "stream": True
-            }).encode("utf-8"),
-            method="POST",
-        )
+            Status messages; progress of a layer only when its percentage changes
+        """
+        body = PULL_BODY % (_dumps(model_name), b"true" if insecure else b"false")
         try:
-            with urllib.request.urlopen(req) as response:
-                for line in response:
-                    data = json.loads(line.decode("utf-8"))
+            with self._request("POST", "/api/pull", body) as response:
+                # (status, percent) of the last progress message yielded
+                last = None
+                for data in _iter_ndjson(response):
                     log = data.get("error") or data.get("status") or "No response"
                     if "status" in data:
                         total = data.get("total")
-                        completed = data.get("completed", 0)
                         if total:
-                            log += f" [{completed}/{total}]"
+                            completed = data.get("completed", 0)
+                            progress = (log, completed * 100 // total)
+                            if progress == last and completed < total:
+                                continue
+                            last = progress
+                            log = "%s [%d/%d]" % (log, completed, total)
                     yield log
         except Exception as e:
             yield f"Failed to download model: {e}"
@@ -0,0 +1,45 @@
+"""
+Caching utilities
+"""
+import functools
+import time
+from typing import Any, Callable, Dict, Tuple
+
+
+def ttl_cache(seconds: float) -> Callable:
+    """
+    Cache a function's results by positional arguments for a limited time
+    
+    Falsy results (empty lists, None) are treated as failures and not cached.
+    The decorated function gets a `cache` dict, keyed by the argument tuple,
+    and an `invalidate(*args)` method that drops one entry.
+    
+    Args:
+        seconds: How long a cached result stays valid
+        
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: Dict[Tuple, Tuple[float, Any]] = {}
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            entry = cache.get(args)
+            now = time.monotonic()
+            if entry is not None and now - entry[0] < seconds:
+                return entry[1]
+            
+            result = func(*args)
+            if result:
+                cache[args] = (now, result)
+            return result
+        
+        def invalidate(*args):
+            cache.pop(args, None)
+        
+        wrapper.cache = cache
+        wrapper.invalidate = invalidate
+        return wrapper
+    
+    return decorator
@@ -0,0 +1,13 @@
+"""
+Shared thread pool for blocking I/O
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Pool for background Ollama API calls and short filesystem scans, shared by all
+# windows; caps the number of concurrent requests and reuses threads instead of
+# starting one per click
+IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ollama-io")
+
+# Pool for file manager copies, kept apart so a long paste doesn't hold up API calls
+FILE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-io")
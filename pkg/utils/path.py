@@ -5,6 +5,14 @@ import sys
 import os
 
 
+# Base directory for resources: PyInstaller's temp folder (_MEIPASS) when
+# packaged, otherwise the project root (the directory of main.py)
+if getattr(sys, 'frozen', False):
+    BASE_PATH = sys._MEIPASS
+else:
+    BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+
+
 def get_resource_path(relative_path: str) -> str:
     """
     Get resource file path (supports packaged execution)
@@ -15,12 +23,4 @@ def get_resource_path(relative_path: str) -> str:
     Returns:
         Absolute path to resource file
     """
-    if getattr(sys, 'frozen', False):
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    else:
-        # Get the directory of the main.py file
-        base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    
-    return os.path.join(base_path, relative_path)
-
+    return os.path.join(BASE_PATH, relative_path)
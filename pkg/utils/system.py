@@ -1,12 +1,41 @@
 """
 System utilities
 """
+import functools
 import platform
-from typing import Optional
-import tkinter as tk
+import re
+import sys
+from typing import TYPE_CHECKING, Optional
 
+# Only used for annotations; the check itself needs no Tk import
+if TYPE_CHECKING:
+    import tkinter as tk
 
-def check_system_compatibility(root: tk.Tk) -> Optional[str]:
+
+# Last Tcl/Tk release with unresponsive widgets on macOS Sonoma (14.x)
+SONOMA_TCL_LAST_AFFECTED = (8, 6, 12)
+
+# Shown when running with an affected Tcl/Tk on macOS Sonoma
+SONOMA_TCL_WARNING = (
+    "Warning: Tkinter Responsiveness Issue Detected\n\n"
+    "You may experience unresponsive GUI elements when "
+    "your cursor is inside the window during startup. "
+    "This is a known issue with Tcl/Tk versions 8.6.12 "
+    "and older on macOS Sonoma.\n\nTo resolve this:\n"
+    "Update to Python 3.11.7+ or 3.12+\n"
+    "Or install Tcl/Tk 8.6.13 or newer separately\n\n"
+    "Temporary workaround: Move your cursor out of "
+    "the window and back in if elements become unresponsive.\n\n"
+    "For more information, visit: https://github.com/python/cpython/issues/110218"
+)
+
+
+def _version_tuple(v: str) -> tuple:
+    """Convert version string to tuple of ints for comparison ("8.6b1" -> (8, 6, 1))"""
+    return tuple(map(int, re.findall(r"\d+", v)))
+
+
+def check_system_compatibility(root: "tk.Tk") -> Optional[str]:
     """
     Check system and software compatibility issues
     
@@ -16,30 +45,31 @@ def check_system_compatibility(root: tk.Tk) -> Optional[str]:
     Returns:
         Warning message string or None
     """
-    def _version_tuple(v):
-        """Convert version string to tuple for comparison"""
-        filled = []
-        for point in v.split("."):
-            filled.append(point.zfill(8))
-        return tuple(filled)
+    # Only macOS has a known issue; skip the Tcl query everywhere else
+    if sys.platform != "darwin":
+        return None
+    return compatibility_warning(root.tk.call("info", "patchlevel"))
 
+
+@functools.lru_cache(maxsize=None)
+def compatibility_warning(tcl_version: str) -> Optional[str]:
+    """
+    Check system and software compatibility issues for a Tcl/Tk version
+    
+    Doesn't touch Tk, so it can run off the Tk thread; it may read OS
+    version files, and the result is cached.
+    
+    Args:
+        tcl_version: Tcl patch level, e.g. "8.6.12"
+        
+    Returns:
+        Warning message string or None
+    """
     # Tcl and macOS issue: https://github.com/python/cpython/issues/110218
-    if platform.system().lower() == "darwin":
+    if sys.platform == "darwin":
         version = platform.mac_ver()[0]
-        if version and 14 <= float(version) < 15:
-            tcl_version = root.tk.call("info", "patchlevel")
-            if _version_tuple(tcl_version) <= _version_tuple("8.6.12"):
-                return (
-                    "Warning: Tkinter Responsiveness Issue Detected\n\n"
-                    "You may experience unresponsive GUI elements when "
-                    "your cursor is inside the window during startup. "
-                    "This is a known issue with Tcl/Tk versions 8.6.12 "
-                    "and older on macOS Sonoma.\n\nTo resolve this:\n"
-                    "Update to Python 3.11.7+ or 3.12+\n"
-                    "Or install Tcl/Tk 8.6.13 or newer separately\n\n"
-                    "Temporary workaround: Move your cursor out of "
-                    "the window and back in if elements become unresponsive.\n\n"
-                    "For more information, visit: https://github.com/python/cpython/issues/110218"
-                )
+        if version and 14 <= _version_tuple(version)[0] < 15:
+            if _version_tuple(tcl_version) <= SONOMA_TCL_LAST_AFFECTED:
+                return SONOMA_TCL_WARNING
     return None
 
@@ -0,0 +1,56 @@
+"""
+Tests for the audio processor
+"""
+import random
+import re
+import unittest
+
+from internal.audio.processor import AudioProcessor
+
+
+def _reference_clean(filename: str) -> str:
+    """The original _clean_filename: one re.sub per pattern, in order"""
+    ad_patterns = [
+        r'[-]{2,}', r'[_]{2,}', r'[=]{2,}', r'[~]{2,}', r'[\.]{2,}',
+        r'^\s+', r'\s+$', r'\s{2,}',
+    ]
+    ad_keywords = [
+        r'www\.\w+\.(com|net|org|cn)',
+        r'@\w+',
+        r'\[.*?广告.*?\]',
+        r'\(.*?广告.*?\)',
+        r'\[.*?推广.*?\]',
+        r'\(.*?推广.*?\)',
+    ]
+    cleaned = filename
+    for pattern in ad_patterns + ad_keywords:
+        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+    cleaned = cleaned.strip(' -_=~.()[]【】（）')
+    cleaned = re.sub(r'[-_\s]+', ' ', cleaned)
+    return cleaned.strip()
+
+
+class CleanFilenameTest(unittest.TestCase):
+    """_clean_filename keeps the behavior of the original pattern chain"""
+
+    # Pieces random names are built from: words, separators, brackets,
+    # ad keywords, sites and handles
+    PIECES = ['a', 'b', '歌', 'Title', '01', ' ', '  ', '-', '--', '_', '__', '=', '==',
+              '~~', '.', '...', '(', ')', '[', ']', '【', '】', '广告', '推广',
+              'www.site.com', 'WWW.X.CN', '@user', '\t']
+
+    def setUp(self):
+        self.processor = AudioProcessor.__new__(AudioProcessor)
+
+    def test_bracketed_ad_keeps_other_brackets(self):
+        self.assertEqual(self.processor._clean_filename('a (b) [广告c] (d) e'), 'a (b) (d) e')
+
+    def test_matches_reference_on_random_names(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            name = ''.join(rng.choice(self.PIECES) for _ in range(rng.randint(1, 12)))
+            self.assertEqual(self.processor._clean_filename(name), _reference_clean(name), repr(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
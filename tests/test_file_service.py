@@ -0,0 +1,78 @@
+"""
+Tests for the file service
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from internal.file import service
+from internal.file.service import FileService, _copy_file
+
+
+class CopyTest(unittest.TestCase):
+    """Copying and pasting files"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.file = os.path.join(self.root, "data.txt")
+        with open(self.file, "wb") as f:
+            f.write(b"keep me")
+
+    def _read(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_copy_file(self):
+        dst = os.path.join(self.root, "copy.txt")
+        _copy_file(self.file, dst)
+        self.assertEqual(self._read(dst), b"keep me")
+
+    def test_copy_file_onto_itself_keeps_data(self):
+        with self.assertRaises(shutil.SameFileError):
+            _copy_file(self.file, self.file)
+        self.assertEqual(self._read(self.file), b"keep me")
+
+    def test_paste_file_into_its_own_directory(self):
+        self.assertFalse(FileService._copy_item(self.file, self.root))
+        self.assertEqual(self._read(self.file), b"keep me")
+
+    def test_paste_folder_into_its_parent(self):
+        folder = os.path.join(self.root, "folder")
+        os.mkdir(folder)
+        inner = os.path.join(folder, "inner.txt")
+        shutil.copy(self.file, inner)
+        self.assertFalse(FileService._copy_item(folder, self.root))
+        self.assertEqual(self._read(inner), b"keep me")
+
+
+class ListingCacheTest(unittest.TestCase):
+    """Cached directory listings"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.file = os.path.join(self.root, "data.txt")
+        with open(self.file, "wb") as f:
+            f.write(b"x")
+        self.service = FileService()
+        self.addCleanup(self.service.close)
+
+    def _size(self) -> str:
+        rows = {row[0]: row for row in self.service.list_directory(self.root)}
+        return rows["data.txt"][3]
+
+    def test_rewritten_file_shows_after_ttl(self):
+        before = self._size()
+        with open(self.file, "wb") as f:
+            f.write(b"x" * 4096)
+        # In-place rewrites leave the directory mtime alone
+        self.assertEqual(self._size(), before)
+        with mock.patch.object(service, "LIST_CACHE_TTL", 0.0):
+            self.assertNotEqual(self._size(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()